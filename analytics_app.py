@@ -2,7 +2,9 @@ import streamlit as st
 import csv
 import os
 from datetime import datetime, timedelta
-import random
+from operator import itemgetter
+
+import numpy as np
 
 st.set_page_config(page_title="Eddie’s Welt – Analytics", layout="wide")
 st.title("📊 Eddie’s Welt – Analytics Dashboard")
@@ -24,65 +26,14 @@ with st.sidebar:
 # DATA
 # =========================================================
 FIELDS = ["ts", "kdp_mode", "dpi", "pdf_mb", "jpeg_quality", "status"]  # status: ok|fail
+# rows are plain tuples in FIELDS order (no per-row dict)
+TS, KDP, DPI, PDF_MB, JPEG_Q, STATUS = range(len(FIELDS))
 
 def _ensure_dir(path: str):
     d = os.path.dirname(path)
     if d:
         os.makedirs(d, exist_ok=True)
 
-def _read_csv(path: str):
-    if not os.path.exists(path):
-        return []
-    rows = []
-    with open(path, "r", encoding="utf-8", newline="") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            rows.append(row)
-    return rows
-
-def _simulate_rows(n_days: int):
-    now = datetime.utcnow()
-    rows = []
-    for d in range(n_days):
-        day = now - timedelta(days=(n_days - 1 - d))
-        exports = random.randint(0, 12)
-        for _ in range(exports):
-            kdp = random.random() < 0.55
-            dpi = random.choice([180, 240, 300]) if kdp else 0
-            pdf = random.uniform(8, 60) if not kdp else random.uniform(25, 120)
-            q = random.choice([60, 65, 70, 75, 80, 85])
-            status = "ok" if random.random() < 0.92 else "fail"
-            ts = (day + timedelta(hours=random.randint(0, 23), minutes=random.randint(0, 59))).strftime("%Y-%m-%d %H:%M:%S")
-            rows.append({
-                "ts": ts,
-                "kdp_mode": "1" if kdp else "0",
-                "dpi": str(dpi),
-                "pdf_mb": f"{pdf:.1f}",
-                "jpeg_quality": str(q),
-                "status": status,
-            })
-    return rows
-
-def _filter_days(rows, n_days: int):
-    if not rows:
-        return rows
-    cutoff = datetime.utcnow() - timedelta(days=n_days)
-    out = []
-    for r in rows:
-        try:
-            t = datetime.strptime(r["ts"], "%Y-%m-%d %H:%M:%S")
-            if t >= cutoff:
-                out.append(r)
-        except:
-            continue
-    return out
-
-rows = _simulate_rows(days) if simulate else _read_csv(log_path)
-rows = _filter_days(rows, days)
-
-# =========================================================
-# METRICS
-# =========================================================
 def _to_float(x, default=0.0):
     try: return float(x)
     except: return default
@@ -91,12 +42,111 @@ def _to_int(x, default=0):
     try: return int(float(x))
     except: return default
 
-total = len(rows)
-ok = sum(1 for r in rows if r.get("status") == "ok")
+def _parse_ts(rows):
+    # one vectorised C parse for the whole column; only a malformed log falls back to per-row (bad -> NaT)
+    ts = [r[TS] for r in rows]
+    try:
+        return np.array(ts, dtype="datetime64[s]")
+    except ValueError:
+        out = np.empty(len(ts), dtype="datetime64[s]")
+        for i, s in enumerate(ts):
+            try: out[i] = np.datetime64(s, "s")
+            except ValueError: out[i] = np.datetime64("NaT")
+        return out
+
+# Typed columns, built once inside the cached loaders -> reruns skip all per-row string coercion.
+# The column dict is the only representation past the loader; tuples are dropped after conversion.
+def _to_columns(rows):
+    n = len(rows)
+    return {
+        "ts": _parse_ts(rows),
+        "ok": np.fromiter((r[STATUS] == "ok" for r in rows), dtype=bool, count=n),
+        "kdp": np.fromiter((r[KDP] == "1" for r in rows), dtype=bool, count=n),
+        "dpi": np.fromiter((_to_int(r[DPI]) for r in rows), dtype=np.int64, count=n),
+        "pdf_mb": np.fromiter((_to_float(r[PDF_MB]) for r in rows), dtype=np.float64, count=n),
+        "jpeg_quality": np.fromiter((_to_int(r[JPEG_Q]) for r in rows), dtype=np.int64, count=n),
+    }
+
+# Sorted by ts once per cache entry -> _filter_days is a binary search + slice, the raw table a tail.
+# NaT rows are dropped here (they never fall inside a window anyway).
+def _sort_by_ts(cols):
+    order = np.argsort(cols["ts"], kind="stable")
+    order = order[~np.isnat(cols["ts"][order])]
+    return {k: v[order] for k, v in cols.items()}
+
+# Cached on (path, mtime, size): reruns (slider/toggle) hit memory, edits to the CSV invalidate.
+# since_day ("YYYY-MM-DD") is pushed into the scan: ISO timestamps sort lexicographically, so
+# out-of-window rows are dropped by a plain string compare without parsing them.
+@st.cache_data(show_spinner=False, max_entries=8)
+def _load_csv_cached(path: str, mtime_ns: int, size: int, since_day: str):
+    rows = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        r = csv.reader(f)
+        header = next(r, None) or []
+        pos = [header.index(k) if k in header else None for k in FIELDS]
+        if pos[TS] is not None:
+            ts_i = pos[TS]
+            if None in pos:  # old/partial header: missing fields read as ""
+                pick = lambda rec: tuple(rec[i] if i is not None else "" for i in pos)
+            else:
+                pick = itemgetter(*pos)
+            for rec in r:
+                try:
+                    if rec[ts_i] >= since_day:
+                        rows.append(pick(rec))
+                except IndexError:  # truncated line
+                    continue
+    return _sort_by_ts(_to_columns(rows))
+
+def _read_csv(path: str, n_days: int):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return _to_columns([])
+    since_day = (datetime.utcnow() - timedelta(days=n_days)).date().isoformat()
+    return _load_csv_cached(path, stat.st_mtime_ns, stat.st_size, since_day)
+
+# Deterministic per (n_days, seed) -> cacheable; the caller seeds with the UTC day so demo data rolls daily.
+# All events are drawn column-wise in NumPy, straight into the typed columns.
+@st.cache_data(show_spinner=False, max_entries=16)
+def _simulate_rows(n_days: int, seed: int):
+    rng = np.random.default_rng(seed)
+    now = np.datetime64(datetime.utcnow(), "s")
+    exports = rng.integers(0, 13, n_days)
+    n = int(exports.sum())
+    day_back = np.repeat(np.arange(n_days - 1, -1, -1), exports)
+    kdp = rng.random(n) < 0.55
+    dpi = np.where(kdp, rng.choice([180, 240, 300], n), 0)
+    pdf = np.where(kdp, rng.uniform(25, 120, n), rng.uniform(8, 60, n)).round(1)
+    q = rng.choice([60, 65, 70, 75, 80, 85], n)
+    ok = rng.random(n) < 0.92
+    offset_s = rng.integers(0, 24, n) * 3600 + rng.integers(0, 60, n) * 60 - day_back * 86400
+    ts = now + offset_s.astype("timedelta64[s]")
+    return _sort_by_ts({"ts": ts, "ok": ok, "kdp": kdp, "dpi": dpi, "pdf_mb": pdf, "jpeg_quality": q})
+
+def _filter_days(cols, n_days: int):
+    # columns are ts-sorted (see _sort_by_ts): O(log N) cutoff search, slices are views
+    cutoff = np.datetime64(datetime.utcnow() - timedelta(days=n_days), "s")
+    ts = cols["ts"]
+    if not len(ts) or ts[0] >= cutoff:  # window covers all data (default slider) -> hand back the cached dict
+        return cols
+    i = int(np.searchsorted(ts, cutoff, side="left"))
+    return {k: v[i:] for k, v in cols.items()}
+
+cols = _simulate_rows(days, datetime.utcnow().date().toordinal()) if simulate else _read_csv(log_path, days)
+cols = _filter_days(cols, days)
+
+# =========================================================
+# METRICS
+# =========================================================
+# one tally pass: each event lands in bin ok + 2*kdp -> [fail/A4, ok/A4, fail/KDP, ok/KDP]
+tally = np.bincount(cols["ok"].view(np.uint8) + 2 * cols["kdp"].view(np.uint8), minlength=4)
+total = int(tally.sum())
+ok = int(tally[1] + tally[3])
 fail = total - ok
-kdp = sum(1 for r in rows if r.get("kdp_mode") == "1")
+kdp = int(tally[2] + tally[3])
 a4 = total - kdp
-avg_pdf = sum(_to_float(r.get("pdf_mb")) for r in rows) / max(1, total)
+avg_pdf = float(cols["pdf_mb"].sum()) / max(1, total)
 
 col1, col2, col3, col4, col5 = st.columns(5)
 col1.metric("Exports (gesamt)", total)
@@ -111,45 +161,62 @@ st.divider()
 # CHARTS (Streamlit-native)
 # =========================================================
 # Daily aggregation
-daily = {}
-for r in rows:
-    try:
-        day = r["ts"][:10]
-        daily.setdefault(day, {"ok": 0, "fail": 0, "kdp": 0, "a4": 0, "pdf_sum": 0.0, "n": 0})
-        bucket = daily[day]
-        bucket["n"] += 1
-        if r.get("status") == "ok":
-            bucket["ok"] += 1
-        else:
-            bucket["fail"] += 1
-        if r.get("kdp_mode") == "1":
-            bucket["kdp"] += 1
-        else:
-            bucket["a4"] += 1
-        bucket["pdf_sum"] += _to_float(r.get("pdf_mb"))
-    except:
-        pass
-
-days_sorted = sorted(daily.keys())
-series_exports = [daily[d]["n"] for d in days_sorted]
-series_ok = [daily[d]["ok"] for d in days_sorted]
-series_fail = [daily[d]["fail"] for d in days_sorted]
-series_avg_pdf = [daily[d]["pdf_sum"] / max(1, daily[d]["n"]) for d in days_sorted]
+# integer day bucket (days since the first event) -> single bincount pass, no sort/unique
+day_num = cols["ts"].astype("datetime64[D]")
+day0 = day_num[0] if len(day_num) else np.datetime64("today", "D")  # ts-sorted -> first is oldest
+day_idx = (day_num - day0).astype(np.int64)
+series_exports = np.bincount(day_idx)
+series_ok = np.bincount(day_idx, weights=cols["ok"]).astype(np.int64)
+series_pdf_sum = np.bincount(day_idx, weights=cols["pdf_mb"])
+present = np.flatnonzero(series_exports)
+series_exports, series_ok, series_pdf_sum = series_exports[present], series_ok[present], series_pdf_sum[present]
+series_fail = series_exports - series_ok
+series_avg_pdf = series_pdf_sum / np.maximum(1, series_exports)
+days_sorted = (day0 + present).astype(str).tolist()  # labels only for days that have events
 
 c1, c2 = st.columns([2, 2])
 
 with c1:
     st.subheader("📈 Exports pro Tag")
-    st.line_chart({"exports": series_exports, "ok": series_ok, "fail": series_fail}, x=days_sorted)
+    st.line_chart({"day": days_sorted, "exports": series_exports, "ok": series_ok, "fail": series_fail}, x="day")
 
 with c2:
     st.subheader("📦 Ø PDF Größe pro Tag (MB)")
-    st.line_chart({"avg_pdf_mb": series_avg_pdf}, x=days_sorted)
+    st.line_chart({"day": days_sorted, "avg_pdf_mb": series_avg_pdf}, x="day")
+
+# Breakdowns: binning/counting in one C pass over the columns (no per-event if/elif or Counter)
+MB_EDGES = np.array([0, 40, 80, 120, 150, np.inf])
+MB_LABELS = ["<40", "40-79", "80-119", "120-149", "150+"]
+mb_counts, _ = np.histogram(cols["pdf_mb"], bins=MB_EDGES)
+dpi_vals, dpi_counts = np.unique(cols["dpi"][cols["kdp"]], return_counts=True)
+
+c3, c4 = st.columns([2, 2])
+
+with c3:
+    st.subheader("🗂️ PDF Größen (MB)")
+    st.bar_chart({"bucket": MB_LABELS, "exports": mb_counts}, x="bucket")
+
+with c4:
+    st.subheader("🖨️ DPI (KDP Exports)")
+    st.bar_chart({"dpi": [str(v) for v in dpi_vals.tolist()], "exports": dpi_counts}, x="dpi")
 
 st.divider()
 
 st.subheader("🧾 Raw Events (letzte 200)")
-st.dataframe(rows[-200:], use_container_width=True)
+# columns are ts-sorted, so the newest 200 are simply the reversed tail (no sort, no partition)
+last = slice(None, -201 if len(cols["ts"]) > 200 else None, -1)
+# column slices go to Streamlit as arrays (Arrow), no list-of-rows round-trip
+st.dataframe(
+    {
+        "ts": cols["ts"][last],
+        "kdp_mode": cols["kdp"][last],
+        "dpi": cols["dpi"][last],
+        "pdf_mb": cols["pdf_mb"][last],
+        "jpeg_quality": cols["jpeg_quality"][last],
+        "status": np.where(cols["ok"][last], "ok", "fail"),
+    },
+    use_container_width=True,
+)
 
 if not simulate:
     if not os.path.exists(log_path):
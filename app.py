@@ -32,14 +32,16 @@ import io
 import os
 import gc
 import time
-import math
 import secrets
+import shutil
 import hashlib
 import sqlite3
 import random
+import threading
 from dataclasses import dataclass
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 import streamlit as st
 import cv2
@@ -48,6 +50,7 @@ import stripe
 from PIL import Image, ImageDraw, ImageFile
 
 from reportlab.pdfgen import canvas
+from reportlab.pdfgen.canvas import FILL_NON_ZERO
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.lib.utils import ImageReader
@@ -61,6 +64,8 @@ from reportlab.graphics.shapes import Drawing
 from reportlab.graphics import renderPDF
 
 import image_wash as iw
+from asset_store import store_asset, drop_assets  # finished PDFs on disk, age-swept
+from pdf_images import draw_page_image  # sketches as 1-bit / DCT XObjects
 from text_layout import draw_wrapped_text  # Paragraph-based wrapping + fit gate
 
 # --- PIL Hardening ---
@@ -98,22 +103,27 @@ def _de_plural(n: int, singular: str, plural: str) -> str:
     return singular if int(n) == 1 else plural
 
 def _stable_seed(s: str) -> int:
-    return int.from_bytes(hashlib.sha256(s.encode("utf-8")).digest()[:8], "big")
+    # blake2b with an 8-byte digest: same determinism, no 32-byte digest to truncate
+    return int.from_bytes(hashlib.blake2b((s or "").encode("utf-8"), digest_size=8).digest(), "big")
 
 # =========================================================
 # RATE LIMITING (SQLite local - Self Healing)
 # =========================================================
 DB_PATH = "fair_use.db"
-
-def _init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("CREATE TABLE IF NOT EXISTS builds (id INTEGER PRIMARY KEY AUTOINCREMENT, ip TEXT, timestamp REAL)")
-    c.execute("CREATE INDEX IF NOT EXISTS idx_builds_ip_ts ON builds(ip, timestamp)")
-    cutoff = time.time() - (7 * 24 * 3600)
-    c.execute("DELETE FROM builds WHERE timestamp < ?", (cutoff,))
-    conn.commit()
-    conn.close()
+DB_RETENTION_S = 7 * 24 * 3600
+
+# One connection per server process (cache_resource survives reruns and is shared by all
+# sessions); WAL lets the per-rerun count read run alongside a build's insert. Streamlit
+# serves sessions from several threads, so every use goes through the lock.
+@st.cache_resource(show_spinner=False)
+def _db() -> Tuple[sqlite3.Connection, threading.Lock]:
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS builds (id INTEGER PRIMARY KEY AUTOINCREMENT, ip TEXT, timestamp REAL)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_builds_ip_ts ON builds(ip, timestamp)")
+    conn.execute("DELETE FROM builds WHERE timestamp < ?", (time.time() - DB_RETENTION_S,))
+    return conn, threading.Lock()
 
 def _get_client_ip() -> str:
     try:
@@ -135,22 +145,18 @@ def _get_client_ip() -> str:
     return "unknown"
 
 def _get_build_count(ip: str, hours: int = 24) -> int:
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+    conn, lock = _db()
     cutoff = time.time() - (hours * 3600)
-    c.execute("SELECT COUNT(*) FROM builds WHERE ip=? AND timestamp>?", (ip, cutoff))
-    row = c.fetchone()
-    conn.close()
+    with lock:
+        row = conn.execute("SELECT COUNT(*) FROM builds WHERE ip=? AND timestamp>?", (ip, cutoff)).fetchone()
     return int(row[0] if row else 0)
 
 def _log_build(ip: str):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("INSERT INTO builds (ip, timestamp) VALUES (?, ?)", (ip, time.time()))
-    conn.commit()
-    conn.close()
-
-_init_db()
+    conn, lock = _db()
+    now = time.time()
+    with lock:
+        conn.execute("INSERT INTO builds (ip, timestamp) VALUES (?, ?)", (ip, now))
+        conn.execute("DELETE FROM builds WHERE timestamp < ?", (now - DB_RETENTION_S,))
 
 # =========================================================
 # ACCESS & LIMIT LOGIC
@@ -260,6 +266,7 @@ DPI = 300
 TRIM_IN = 8.5
 TRIM = TRIM_IN * inch
 BLEED = 0.125 * inch
+WASH_MAX_SIDE = int((TRIM + 2 * BLEED) * DPI / inch)  # largest sketch target; washed photos are capped to it
 SAFE_INTERIOR = 0.375 * inch
 
 INK_BLACK = colors.Color(0, 0, 0)
@@ -277,6 +284,13 @@ SPINE_TEXT_MIN_PAGES = 79
 
 MAX_SKETCH_CACHE = 256
 MAX_WASH_CACHE = 64
+MAX_UPLOAD_KEYS = 256
+DISK_CACHE_DIR = "cache"
+DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024  # per kind (wash / sketch)
+DISK_CACHE_TTL_S = 24 * 3600  # washed user photos don't outlive a day without use
+# bump whenever wash or sketch output changes for the same upload (cap, crop, filter, encoder):
+# entries live under cache/<version>/, older version dirs are swept on the next write
+PIPELINE_VERSION = "v6.1"
 
 BUILD_TAG = "v6.0.0-clean-core"
 
@@ -362,6 +376,25 @@ def _set_font(c: canvas.Canvas, bold: bool, size: int) -> float:
     c.setFont(FONTS["bold"] if bold else FONTS["normal"], size)
     return size * 1.22
 
+def _draw_centred_block(c: canvas.Canvas, cx: float, rows) -> None:
+    # static centred lines [(bold, size, color, y, text), ...] as ONE BT..ET text object:
+    # Tf / rg only where they change instead of a text object + font op per drawCentredString
+    t = c.beginText()
+    font = fill = None
+    for bold, size, color, y, text in rows:
+        fn = FONTS["bold"] if bold else FONTS["normal"]
+        if (fn, size) != font:
+            t.setFont(fn, size)
+            font = (fn, size)
+        if color is not fill:
+            t.setFillColor(color)
+            fill = color
+        t.setTextOrigin(cx - stringWidth(text, fn, size) / 2, y)
+        t.textOut(text)
+    c.drawText(t)
+    c.setFont(*font)  # keep the canvas' font/fill state in sync with the emitted ops
+    c.setFillColor(fill)
+
 def _kid_short(s: str, max_words: int = 4) -> str:
     s = (s or "").strip().replace("•", " ").replace("→", " ").replace("-", " ")
     return " ".join([w for w in s.split() if w and len(w) > 1][:max_words])
@@ -386,45 +419,33 @@ class QuestTrackers:
 def _new_trackers() -> QuestTrackers:
     return QuestTrackers(used_proof=set(), used_quest=set(), used_note=set())
 
-def build_book_schedule(seed: int, start_hour: int, count: int) -> Tuple[Dict[int, ScheduledQuest], QuestTrackers]:
-    if not qd or not hasattr(qd, "get_quest"):
-        raise RuntimeError("quest_data.py missing/invalid: get_quest() required for v6.")
+def build_book_schedule(seed: int, start_hour: int, count: int) -> Tuple[List[ScheduledQuest], QuestTrackers]:
+    if not qd or not hasattr(qd, "draw_quests"):
+        raise RuntimeError("quest_data.py missing/invalid: draw_quests() required for v6.")
 
     rng = random.Random(int(seed) & 0xFFFFFFFFFFFFFFFF)
     tr = _new_trackers()
-    schedule: Dict[int, ScheduledQuest] = {}
+    schedule: List[ScheduledQuest] = []  # page order: schedule[i] is the quest for hour start_hour + i
 
-    for i in range(int(count)):
+    # whole book drawn up front: one batch per pool instead of a filtered pick per page
+    n = int(count)
+    quests = qd.draw_quests("quest", n, rng=rng, used_ids=tr.used_quest)
+    proofs = qd.draw_quests("proof", n, rng=rng, used_ids=tr.used_proof)
+    try:
+        notes = [(getattr(it, "text", "") or "").strip() for it in qd.draw_quests("note", n, rng=rng, used_ids=tr.used_note)]
+    except Exception:
+        notes = [""] * n
+
+    for i, (q_item, p_item, n_text) in enumerate(zip(quests, proofs, notes)):
         hour = (int(start_hour) + i) % 24
         zone = _get_zone_for_hour(hour)
-
-        q_item = qd.get_quest("quest", tr.used_quest, rng=rng)
-        qid = getattr(q_item, "qid", "")
-        if qid:
-            tr.used_quest.add(qid)
-
-        p_item = qd.get_quest("proof", tr.used_proof, rng=rng)
-        pid = getattr(p_item, "qid", "")
-        if pid:
-            tr.used_proof.add(pid)
-
-        n_text = ""
-        try:
-            n_item = qd.get_quest("note", tr.used_note, rng=rng)
-            nid = getattr(n_item, "qid", "")
-            if nid:
-                tr.used_note.add(nid)
-            n_text = (getattr(n_item, "text", "") or "").strip()
-        except Exception:
-            n_text = ""
-
-        schedule[hour] = ScheduledQuest(
+        schedule.append(ScheduledQuest(
             title=f"{zone.quest_type}: {zone.name}",
             xp=10 + (i % 10) + (hour % 5),
             thinking=(getattr(q_item, "text", "") or "").strip(),
             proof=(getattr(p_item, "text", "") or "").strip(),
             note=n_text,
-        )
+        ))
 
     return schedule, tr
 
@@ -458,15 +479,42 @@ def _draw_eddie(c: canvas.Canvas, cx: float, cy: float, r: float, style: str = "
         c.roundRect(cx - r * 0.12, cy - r * 0.45, r * 0.24, r * 0.28, r * 0.10, stroke=0, fill=1)
     c.restoreState()
 
-@dataclass
-class ShapeSpec:
-    kind: str
-    cx: float
-    cy: float
-    size: float
-    rot: float
-
-def _generate_shapes(pb: PageBox, sl: float, sr: float, stb: float, pre_reader: bool, seed: int) -> List[ShapeSpec]:
+def _draw_eddie_mark(c: canvas.Canvas, cx: float, cy: float, r: float, style: str = "tongue"):
+    # per-page guide mark: drawn once into a Form XObject (origin = centre), pages only "Do" it
+    name = f"Eddie_{style}_{int(round(r * 1000))}"
+    if not c.hasForm(name):
+        c.beginForm(name, lowerx=-r - 4, lowery=-r - 4, upperx=r + 4, uppery=r + 4)
+        _draw_eddie(c, 0, 0, r, style=style)
+        c.endForm()
+    c.saveState()
+    c.translate(cx, cy)
+    c.doForm(name)
+    c.restoreState()
+
+SHAPE_TRIANGLE, SHAPE_SQUARE, SHAPE_STAR = range(3)
+
+class Shapes(NamedTuple):
+    kind: np.ndarray  # int8 SHAPE_* codes
+    cx: np.ndarray
+    cy: np.ndarray
+    size: np.ndarray
+    rot: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+_NO_SHAPES = Shapes(np.empty(0, np.int8), *(np.empty(0) for _ in range(4)))
+
+# unit outlines (half-size 1, counter-clockwise) per SHAPE_* code; star: outer radius 1, inner 1/2.5
+_STAR_T = np.arange(10) * (np.pi / 5) - (np.pi / 2)
+_STAR_R = np.where(np.arange(10) % 2 == 0, 1.0, 1.0 / 2.5)
+_SHAPE_UNIT = (
+    np.array([(0.0, 1.0), (-1.0, -1.0), (1.0, -1.0)]),
+    np.array([(-1.0, -1.0), (1.0, -1.0), (1.0, 1.0), (-1.0, 1.0)]),
+    np.column_stack((_STAR_R * np.cos(_STAR_T), _STAR_R * np.sin(_STAR_T))),
+)
+
+def _generate_shapes(pb: PageBox, sl: float, sr: float, stb: float, pre_reader: bool, seed: int) -> Shapes:
     rng = np.random.default_rng(seed)
     header_h = 0.75 * inch
     card_h = (2.45 * inch) if pre_reader else (2.85 * inch)
@@ -474,52 +522,40 @@ def _generate_shapes(pb: PageBox, sl: float, sr: float, stb: float, pre_reader:
     min_x, max_x = sl + pad, pb.full_w - sr - pad
     min_y, max_y = stb + card_h + pad, pb.full_h - stb - header_h - pad
     if max_x <= min_x or max_y <= min_y:
-        return []
-    shapes: List[ShapeSpec] = []
-    for _ in range(int(rng.integers(3, 8))):
-        shapes.append(ShapeSpec(
-            kind=str(rng.choice(["triangle", "square", "star"])),
-            cx=float(rng.uniform(min_x, max_x)),
-            cy=float(rng.uniform(min_y, max_y)),
-            size=float(rng.uniform(0.28, 0.58)) * inch,
-            rot=float(rng.uniform(0, 360))
-        ))
-    return shapes
+        return _NO_SHAPES
+    # one batched draw per attribute instead of five RNG calls per shape
+    n = int(rng.integers(3, 8))
+    return Shapes(
+        kind=rng.integers(0, 3, n).astype(np.int8),
+        cx=rng.uniform(min_x, max_x, n),
+        cy=rng.uniform(min_y, max_y, n),
+        size=rng.uniform(0.28, 0.58, n) * inch,
+        rot=rng.uniform(0, 360, n),
+    )
 
-def _draw_shapes(c: canvas.Canvas, shapes: List[ShapeSpec]):
-    if not shapes:
+def _draw_shapes(c: canvas.Canvas, shapes: Shapes):
+    if not len(shapes):
         return
+    # outlines rotated + placed in numpy and emitted as subpaths of ONE path:
+    # a single fill+stroke for the page instead of save/translate/rotate/draw/restore per shape
+    t = np.radians(shapes.rot)
+    cos, sin = np.cos(t), np.sin(t)
+    p = c.beginPath()
+    for i, kind in enumerate(shapes.kind.tolist()):
+        u = _SHAPE_UNIT[kind] * (shapes.size[i] / 2)
+        pts = np.column_stack((u[:, 0] * cos[i] - u[:, 1] * sin[i] + shapes.cx[i],
+                               u[:, 0] * sin[i] + u[:, 1] * cos[i] + shapes.cy[i])).tolist()
+        p.moveTo(*pts[0])
+        for x, y in pts[1:]:
+            p.lineTo(x, y)
+        p.close()
     c.saveState()
     c.setStrokeColor(INK_BLACK)
     c.setLineWidth(2.2)
     c.setFillColor(colors.white)
-    for s in shapes:
-        c.saveState()
-        c.translate(s.cx, s.cy)
-        c.rotate(s.rot)
-        if s.kind == "triangle":
-            p = c.beginPath()
-            p.moveTo(0, s.size / 2)
-            p.lineTo(-s.size / 2, -s.size / 2)
-            p.lineTo(s.size / 2, -s.size / 2)
-            p.close()
-            c.drawPath(p, fill=1, stroke=1)
-        elif s.kind == "square":
-            c.rect(-s.size / 2, -s.size / 2, s.size, s.size, fill=1, stroke=1)
-        else:
-            p = c.beginPath()
-            r_out, r_in = s.size / 2, (s.size / 2) / 2.5
-            for i in range(10):
-                r = r_out if i % 2 == 0 else r_in
-                theta = i * (math.pi / 5) - (math.pi / 2)
-                x, y = r * math.cos(theta), r * math.sin(theta)
-                if i == 0:
-                    p.moveTo(x, y)
-                else:
-                    p.lineTo(x, y)
-            p.close()
-            c.drawPath(p, fill=1, stroke=1)
-        c.restoreState()
+    # non-zero winding: every _SHAPE_UNIT outline is counter-clockwise, so overlapping shapes
+    # fill as their union (the even-odd default would punch the overlap back out to the sketch)
+    c.drawPath(p, fill=1, stroke=1, fillMode=FILL_NON_ZERO)
     c.restoreState()
 
 # =========================================================
@@ -541,6 +577,70 @@ def _lru_put(od: "OrderedDict", key, value, max_items: int):
     while len(od) > max_items:
         od.popitem(last=False)
 
+# Disk tier behind the session LRUs: names are upload content hashes, the directory carries
+# PIPELINE_VERSION so a deploy with different wash/sketch output never serves old files;
+# file mtime is the LRU clock for size-capped eviction and the age for DISK_CACHE_TTL_S.
+def _disk_cache_dir(kind: str) -> str:
+    return os.path.join(DISK_CACHE_DIR, PIPELINE_VERSION, kind)
+
+def _disk_cache_get(kind: str, name: str) -> Optional[bytes]:
+    p = os.path.join(_disk_cache_dir(kind), name)
+    try:
+        if time.time() - os.stat(p).st_mtime > DISK_CACHE_TTL_S:
+            os.remove(p)
+            return None
+        with open(p, "rb") as f:
+            b = f.read()
+        os.utime(p)
+    except OSError:
+        return None
+    return b
+
+def _disk_cache_put(kind: str, name: str, data: bytes) -> None:
+    d = _disk_cache_dir(kind)
+    p = os.path.join(d, name)
+    tmp = f"{p}.{secrets.token_hex(4)}.tmp"
+    try:
+        os.makedirs(d, exist_ok=True)
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, p)  # atomic: concurrent sessions never see half a file
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return
+    _disk_cache_evict(d)
+
+def _disk_cache_evict(d: str) -> None:
+    try:
+        stale = [e.path for e in os.scandir(DISK_CACHE_DIR) if e.is_dir() and e.name != PIPELINE_VERSION]
+        entries = [(e.stat().st_mtime, e.stat().st_size, e.path) for e in os.scandir(d) if e.is_file()]
+    except OSError:
+        return
+    for old in stale:  # previous pipeline versions (and the pre-versioned cache/wash, cache/sketch)
+        shutil.rmtree(old, ignore_errors=True)
+    cutoff = time.time() - DISK_CACHE_TTL_S
+    for mt, _, path in entries:
+        if mt < cutoff:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    entries = [e for e in entries if e[0] >= cutoff]
+    total = sum(sz for _, sz, _ in entries)
+    if total <= DISK_CACHE_MAX_BYTES:
+        return
+    for _, sz, path in sorted(entries):
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= sz
+        if total <= DISK_CACHE_MAX_BYTES:
+            break
+
 def _read_upload_bytes(up) -> bytes:
     try:
         b = up.getvalue()
@@ -557,60 +657,172 @@ def _wash_bytes(raw: bytes) -> bytes:
     if not raw:
         raise ValueError("empty upload")
     if hasattr(iw, "wash_image_bytes"):
-        return bytes(iw.wash_image_bytes(raw))
+        return bytes(iw.wash_image_bytes(raw, max_short_side=WASH_MAX_SIDE))
     if hasattr(iw, "wash_bytes"):
         return bytes(iw.wash_bytes(raw))
     raise RuntimeError("image_wash logic missing")
 
 def _wash_upload_to_bytes(up) -> bytes:
-    raw = _read_upload_bytes(up)
-    h = hashlib.sha256(raw).hexdigest()
+    h = _upload_key(up)
     wc = _get_lru("wash_cache", MAX_WASH_CACHE)
     if h in wc:
         wc.move_to_end(h)
         return wc[h]
-    w = _wash_bytes(raw)
+    w = _disk_cache_get("wash", f"{h}.png")
+    if w is None:
+        w = _wash_bytes(_read_upload_bytes(up))
+        _disk_cache_put("wash", f"{h}.png", w)
     _lru_put(wc, h, w, MAX_WASH_CACHE)
     return w
 
-def _sketch_compute(img_bytes: bytes, target_w: int, target_h: int) -> bytes:
-    arr = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
-    if arr is None:
+def _sketch_array(img_bytes: bytes, target_w: int, target_h: int, pencil: bool = False) -> np.ndarray:
+    # decode straight to 8-bit gray (zero-copy buffer view): no 3-channel frame, no cvtColor pass
+    gray = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
         raise RuntimeError("OpenCV decode failed")
 
-    h_arr, w_arr = arr.shape[:2]
+    h_arr, w_arr = gray.shape
     if (w_arr * h_arr) > 25_000_000:
         raise ValueError("Bildauflösung zu groß (max ~25MP).")
 
-    gray = cv2.cvtColor(arr, cv2.COLOR_BGR2GRAY)
-    blurred = cv2.GaussianBlur(255 - gray, (21, 21), 0)
-    sketch = cv2.divide(gray, np.clip(255 - blurred, 1, 255), scale=256.0)
-    norm = cv2.normalize(sketch, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+    # square center crop + INTER_AREA downsample to the page size *before* the filter chain:
+    # the 21px blur then runs on ~target pixels instead of the full photo (kernel scaled along)
+    s = min(w_arr, h_arr)
+    gray = gray[(h_arr - s) // 2:(h_arr - s) // 2 + s, (w_arr - s) // 2:(w_arr - s) // 2 + s]
+    scale = max(target_w, target_h) / s
+    k = 21
+    if scale < 1.0:
+        gray = cv2.resize(gray, (target_w, target_h), interpolation=cv2.INTER_AREA)
+        k = max(3, int(round(21 * scale)) | 1)
+
+    # dodge blend in one scratch buffer: blur(~gray) -> ~ -> max(1) -> gray*256/x -> minmax,
+    # all written back via dst= instead of a fresh full-frame array per step
+    norm = cv2.GaussianBlur(cv2.bitwise_not(gray), (k, k), 0)
+    cv2.bitwise_not(norm, dst=norm)
+    cv2.max(norm, 1, dst=norm)
+    cv2.divide(gray, norm, dst=norm, scale=256.0)
+    # min/max from a 1/64 strided sample, then one saturating scale pass (convertScaleAbs)
+    # instead of NORM_MINMAX's two full sweeps; skipped when the sample already spans 0..255
+    sub = norm[::8, ::8]
+    lo, hi = int(sub.min()), int(sub.max())
+    if hi > lo and (lo, hi) != (0, 255):
+        cv2.convertScaleAbs(norm, dst=norm, alpha=255.0 / (hi - lo), beta=-lo * 255.0 / (hi - lo))
+
+    if norm.shape[::-1] != (target_w, target_h):  # only when upscaling a small photo
+        # bilinear: output is thresholded to 1-bit right after, LANCZOS only adds cost + ringing
+        norm = cv2.resize(norm, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
+    if pencil:
+        return norm  # soft pencil look keeps the gray tones
+    _, bw = cv2.threshold(norm, 200, 255, cv2.THRESH_BINARY)
+    return bw
+
+def _sketch_compute(img_bytes: bytes, target_w: int, target_h: int, pencil: bool = False) -> bytes:
+    arr = _sketch_array(img_bytes, target_w, target_h, pencil)
+    if pencil:
+        # gray JPEG, embedded 1:1 as DCT (no re-encode); optimized Huffman tables: ~25% fewer bytes
+        ok, enc = cv2.imencode(".jpg", arr, [cv2.IMWRITE_JPEG_QUALITY, 78, cv2.IMWRITE_JPEG_OPTIMIZE, 1])
+    else:
+        # 1-bit PNG entirely in OpenCV (no PIL copies, no per-pixel Python callback)
+        ok, enc = cv2.imencode(".png", arr, [cv2.IMWRITE_PNG_BILEVEL, 1, cv2.IMWRITE_PNG_COMPRESSION, 3])
+    if not ok:
+        raise RuntimeError("OpenCV sketch encode failed")
+    del arr
+    return enc.tobytes()
+
+def _upload_key(up) -> str:
+    # full-content sha256 (SHA-NI in OpenSSL, ~1 GB/s) computed once per uploaded file and
+    # remembered by Streamlit's per-upload file_id, so rebuilds and the cover reuse it
+    fid = getattr(up, "file_id", None)
+    memo = _get_lru("upload_keys", MAX_UPLOAD_KEYS)
+    if fid is not None and fid in memo:
+        memo.move_to_end(fid)
+        return memo[fid]
+    k = hashlib.sha256(_read_upload_bytes(up)).hexdigest()
+    if fid is not None:
+        _lru_put(memo, fid, k, MAX_UPLOAD_KEYS)
+    return k
+
+def _get_sketch_cached(up, upload_key: str, target_w: int, target_h: int, pencil: bool = False) -> bytes:
+    # keyed on the raw upload hash (computed once per upload by the caller):
+    # a hit skips the wash lookup and hashing the washed PNG again
+    cache = _get_lru("sketch_cache", MAX_SKETCH_CACHE)
+    key = (upload_key, int(target_w), int(target_h), bool(pencil))
+    out = _sketch_lookup(cache, key)
+    if out is None:
+        out = _sketch_compute(_wash_upload_to_bytes(up), target_w, target_h, pencil)
+        _sketch_store(cache, key, out)
+    return out
 
-    pil = Image.fromarray(norm).convert("L")
-    sw, sh = pil.size
-    s = min(sw, sh)
-    pil = pil.crop(((sw - s) // 2, (sh - s) // 2, (sw + s) // 2, (sw + s) // 2)).resize((target_w, target_h), Image.LANCZOS)
-    out = io.BytesIO()
-    pil.point(lambda p: 255 if p > 200 else 0).convert("1").save(out, format="PNG", optimize=True)
-    outv = out.getvalue()
-    del arr, gray, blurred, sketch, norm, pil
-    gc.collect()
-    return outv
+def _sketch_disk_name(key) -> str:
+    k, w, h, pencil = key
+    return f"{k}_{w}x{h}.jpg" if pencil else f"{k}_{w}x{h}.png"
 
-def _get_sketch_cached(img_bytes: bytes, target_w: int, target_h: int) -> bytes:
-    cache = _get_lru("sketch_cache", MAX_SKETCH_CACHE)
-    key = (hashlib.sha256(img_bytes).hexdigest(), int(target_w), int(target_h))
+def _sketch_lookup(cache: "OrderedDict", key) -> Optional[bytes]:
     if key in cache:
         cache.move_to_end(key)
         return cache[key]
-    out = _sketch_compute(img_bytes, target_w, target_h)
-    _lru_put(cache, key, out, MAX_SKETCH_CACHE)
+    out = _disk_cache_get("sketch", _sketch_disk_name(key))
+    if out is not None:
+        _lru_put(cache, key, out, MAX_SKETCH_CACHE)
     return out
 
+def _sketch_store(cache: "OrderedDict", key, out: bytes) -> None:
+    _lru_put(cache, key, out, MAX_SKETCH_CACHE)
+    _disk_cache_put("sketch", _sketch_disk_name(key), out)
+
+def _wash_and_sketch(up, k: str, washed: Optional[bytes], target_w: int, target_h: int,
+                     pencil: bool) -> Tuple[bytes, bytes, bool]:
+    # worker side of the prefetch: disk tier first, raw bytes are only read + washed on a real miss
+    fresh = False
+    if washed is None:
+        washed = _disk_cache_get("wash", f"{k}.png")
+    if washed is None:
+        washed, fresh = _wash_bytes(_read_upload_bytes(up)), True
+    return washed, _sketch_compute(washed, target_w, target_h, pencil), fresh
+
+def _prefetch_sketches(uploads, upload_keys: List[str], target_w: int, target_h: int, pencil: bool = False) -> None:
+    # Warms wash_cache + sketch_cache for all uploads at once before drawing starts.
+    # Threads, not processes: cv2 and PIL drop the GIL in decode/filter/PNG encode, the caches
+    # live in session_state on this thread, and the Streamlit script module is not importable
+    # from a worker process.
+    cache = _get_lru("sketch_cache", MAX_SKETCH_CACHE)
+    todo = {}
+    for up, k in zip(uploads, upload_keys):
+        if k not in todo and _sketch_lookup(cache, (k, int(target_w), int(target_h), bool(pencil))) is None:
+            todo[k] = up
+    if len(todo) <= 2:  # not worth a pool; the page loop computes them on demand
+        return
+    # wash_cache hits resolved here (session_state is script-thread only): a line build followed
+    # by a pencil build washes every upload once, not once per style
+    wc = _get_lru("wash_cache", MAX_WASH_CACHE)
+    tasks = [(up, k, wc.get(k)) for k, up in todo.items()]
+    # streamed: every task reads its own upload and results are stored as they arrive, so only
+    # ~max_workers raw/decoded photos are alive at a time instead of the whole batch
+    with ThreadPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as ex:
+        done = ex.map(lambda t: _wash_and_sketch(*t, target_w, target_h, pencil), tasks)
+        for k, (washed, sk, fresh) in zip(todo, done):
+            _lru_put(wc, k, washed, MAX_WASH_CACHE)
+            if fresh:
+                _disk_cache_put("wash", f"{k}.png", washed)
+            _sketch_store(cache, (k, int(target_w), int(target_h), bool(pencil)), sk)
+            del washed, sk
+
 # =========================================================
 # OVERLAY (QUEST CARD) — Paragraph wrapping + HARD overflow gate
 # =========================================================
+def _timeline_form(c: canvas.Canvas, step: float) -> str:
+    # origin = first dot; built once per canvas (and per step, i.e. usable header width)
+    name = f"Timeline{int(round(step * 1000))}"
+    if not c.hasForm(name):
+        c.beginForm(name, lowerx=-4, lowery=-4, upperx=23 * step + 4, uppery=4)
+        c.setStrokeColor(INK_BLACK)
+        c.setLineWidth(0.5)
+        for h_idx in range(24):
+            c.setFillColor(colors.Color(*_get_hour_color(h_idx)))
+            c.circle(h_idx * step, 0, 2, fill=1, stroke=1)
+        c.endForm()
+    return name
+
 def _draw_quest_overlay(c, pb, sl, sr, stb, hour, mission: Mission, debug, pre_reader, is_senior):
     hh = 0.75 * inch
     x0 = sl
@@ -626,24 +838,23 @@ def _draw_quest_overlay(c, pb, sl, sr, stb, hour, mission: Mission, debug, pre_r
     c.setLineWidth(1)
     c.rect(x0, ytb, w, hh, fill=1, stroke=1)
 
-    # Timeline (kid only)
+    # Timeline (kid only): the 24 small dots are one Form XObject shared by every page,
+    # only the highlighted current hour is drawn per page (it fully covers its small dot)
     if not is_senior:
         pad_x = 0.25 * inch
         avail_w = w - 2 * pad_x
         step = avail_w / 23.0
         timeline_y = ytb + hh - 0.18 * inch
-        for h_idx in range(24):
-            hx = x0 + pad_x + h_idx * step
-            dot_rgb = _get_hour_color(h_idx)
-            c.setFillColor(colors.Color(*dot_rgb))
-            if h_idx == hour:
-                c.setStrokeColor(colors.white)
-                c.setLineWidth(1.2)
-                c.circle(hx, timeline_y, 4, fill=1, stroke=1)
-            else:
-                c.setStrokeColor(INK_BLACK)
-                c.setLineWidth(0.5)
-                c.circle(hx, timeline_y, 2, fill=1, stroke=1)
+        c.saveState()
+        c.translate(x0 + pad_x, timeline_y)
+        c.doForm(_timeline_form(c, step))
+        c.restoreState()
+        c.setFillColor(colors.Color(*_get_hour_color(hour)))
+        c.setStrokeColor(colors.white)
+        c.setLineWidth(1.2)
+        c.circle(x0 + pad_x + hour * step, timeline_y, 4, fill=1, stroke=1)
+        c.setStrokeColor(INK_BLACK)
+        c.setLineWidth(0.5)  # card box below keeps the thin timeline stroke
 
     # Header text
     c.setFillColor(colors.white if sum(z_rgb[:3]) < 1.5 else INK_BLACK)
@@ -782,23 +993,39 @@ def _cover_collage_png(uploads, size_px: int, seed: int) -> Optional[bytes]:
             if k >= len(files):
                 break
             try:
-                sk = _sketch_compute(_wash_upload_to_bytes(files[k]), cell, cell)
-                tile = Image.open(io.BytesIO(sk)).convert("RGB")
+                # raw mask straight into the collage, no PNG encode + decode per tile
+                tile = Image.fromarray(_sketch_array(_wash_upload_to_bytes(files[k]), cell, cell)).convert("RGB")
             except Exception:
                 tile = Image.new("RGB", (cell, cell), (255, 255, 255))
             canvas_img.paste(tile, (gap + c_ * (cell + gap), gap + r * (cell + gap)))
             k += 1
             del tile
-            gc.collect()
     ImageDraw.Draw(canvas_img).rectangle([0, 0, size_px - 1, size_px - 1], outline=(0, 0, 0), width=max(2, size_px // 250))
     out = io.BytesIO()
-    canvas_img.save(out, format="PNG", optimize=True)
+    # intermediate only (drawImage decodes and re-Flates it): fastest zlib level, no optimize pass
+    canvas_img.save(out, format="PNG", compress_level=1)
     return out.getvalue()
 
+# =========================================================
+# OUTRO QR
+# =========================================================
+QR_SIZE = 1.85 * inch
+
+def _qr_drawing(url: str, size: float) -> Drawing:
+    qr_code = qr.QrCodeWidget(url)
+    bounds = qr_code.getBounds()
+    scale = size / max(bounds[2] - bounds[0], bounds[3] - bounds[1])
+    d = Drawing(size, size, transform=[scale, 0, 0, scale, -bounds[0] * scale, -bounds[1] * scale])
+    d.add(qr_code)
+    return d
+
+# QR_URL is constant -> encode once at import, not on every build
+_QR_DRAWING = _qr_drawing(QR_URL, QR_SIZE)
+
 # =========================================================
 # BUILDERS
 # =========================================================
-def build_interior(name, uploads, kdp, debug, preflight, paper, eddie, style, pre_reader, build_nonce, is_senior) -> bytes:
+def build_interior(name, uploads, kdp, debug, preflight, paper, eddie, style, pre_reader, build_nonce, is_senior, pencil=False) -> bytes:
     if not qd:
         raise RuntimeError(f"quest_data.py fehlt/fehlerhaft: {_QD_IMPORT_ERROR if '_QD_IMPORT_ERROR' in globals() else ''}")
 
@@ -812,10 +1039,9 @@ def build_interior(name, uploads, kdp, debug, preflight, paper, eddie, style, pr
     MAX_TOTAL_UPLOAD_BYTES = 160 * 1024 * 1024
     total_bytes = 0
     for up in uploads:
-        try:
-            total_bytes += len(up.getbuffer())
-        except Exception:
-            total_bytes += len(_read_upload_bytes(up))
+        # UploadedFile.size is set at upload time -> no buffer export/copy just to read a length
+        n = getattr(up, "size", None)
+        total_bytes += n if isinstance(n, int) else len(_read_upload_bytes(up))
         if total_bytes > MAX_TOTAL_UPLOAD_BYTES:
             raise ValueError(f"Uploads insgesamt zu groß (max {MAX_TOTAL_UPLOAD_BYTES // (1024*1024)}MB). Bitte weniger/kleinere Bilder.")
 
@@ -823,18 +1049,23 @@ def build_interior(name, uploads, kdp, debug, preflight, paper, eddie, style, pr
     MISSION_PAGES = 24
 
     pb = page_box(TRIM, TRIM, kdp_bleed=bool(kdp))
-    final = (list(uploads) * (MISSION_PAGES // len(uploads) + 1))[:MISSION_PAGES]
-
-    buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=(pb.full_w, pb.full_h))
+    uploads = list(uploads)  # once; final / prefetch / keys all index this list
+    final = (uploads * (MISSION_PAGES // len(uploads) + 1))[:MISSION_PAGES]
+    upload_keys = [_upload_key(up) for up in uploads]  # final[i] is uploads[i % n] -> one hash per upload
+    sk_w, sk_h = int(pb.full_w * DPI / 72), int(pb.full_h * DPI / 72)
+    _prefetch_sketches(uploads, upload_keys, sk_w, sk_h, bool(pencil))
+
+    # no file object: getpdfdata() hands back the serialized bytes (BytesIO + getvalue = 2nd copy)
+    c = canvas.Canvas(None, pagesize=(pb.full_w, pb.full_h))
     c.setTitle(f"{APP_TITLE} — Interior")
     c.setAuthor("Eddies World")
     c.setSubject(f"nonce={build_nonce}")
 
-    schedule, trackers = build_book_schedule(_stable_seed(build_nonce), start_hour=6, count=MISSION_PAGES)
-
+    # hash name/nonce once per build; page seeds below are plain int mixes of these two
     seed_base = _stable_seed(name)
     nonce_seed = _stable_seed(build_nonce)
+    schedule, trackers = build_book_schedule(nonce_seed, start_hour=6, count=MISSION_PAGES)
+
     current_page_idx = 0
 
     # INTRO PAGE (simple)
@@ -842,22 +1073,17 @@ def build_interior(name, uploads, kdp, debug, preflight, paper, eddie, style, pr
     c.setFillColor(colors.white)
     c.rect(0, 0, pb.full_w, pb.full_h, fill=1, stroke=0)
     gen = _name_genitive(name)
-    c.setFillColor(INK_BLACK)
-    _set_font(c, True, 34)
-
     book_title = f"{gen} Tagesbegleiter" if is_senior else f"{gen} Abenteuerbuch"
     subtitle = "24 Stunden • In Ruhe betrachten • Entspannen" if is_senior else "24 Stunden • 24 Mini-Quests • Haken setzen"
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 1.90 * inch, book_title)
-    _set_font(c, False, 14)
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 2.35 * inch, "Erstellt mit")
-    _set_font(c, True, 18)
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 2.70 * inch, "E. P. E.")
-    _set_font(c, False, 14)
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 3.00 * inch, "Eddie's Print Engine")
     _draw_eddie(c, pb.full_w / 2, pb.full_h / 2, 1.20 * inch, style=style)
-    c.setFillColor(INK_GRAY_70)
-    _set_font(c, False, 13)
-    c.drawCentredString(pb.full_w / 2, stb + 0.75 * inch, subtitle)
+    top = pb.full_h - stb
+    _draw_centred_block(c, pb.full_w / 2, [
+        (True, 34, INK_BLACK, top - 1.90 * inch, book_title),
+        (False, 14, INK_BLACK, top - 2.35 * inch, "Erstellt mit"),
+        (True, 18, INK_BLACK, top - 2.70 * inch, "E. P. E."),
+        (False, 14, INK_BLACK, top - 3.00 * inch, "Eddie's Print Engine"),
+        (False, 13, INK_GRAY_70, stb + 0.75 * inch, subtitle),
+    ])
 
     if debug:
         _draw_kdp_debug_guides(c, pb, sl, sr, stb)
@@ -870,24 +1096,18 @@ def build_interior(name, uploads, kdp, debug, preflight, paper, eddie, style, pr
         sl, sr, stb = safe_margins_for_page(total, bool(kdp), current_page_idx, pb)
 
         # background sketch
-        sk_bytes = _get_sketch_cached(
-            _wash_upload_to_bytes(up),
-            int(pb.full_w * DPI / 72),
-            int(pb.full_h * DPI / 72),
-        )
-        c.drawImage(ImageReader(io.BytesIO(sk_bytes)), 0, 0, pb.full_w, pb.full_h)
+        k = upload_keys[i % len(uploads)]
+        draw_page_image(c, f"Sketch{k[:24]}", _get_sketch_cached(up, k, sk_w, sk_h, bool(pencil)), 0, 0, pb.full_w, pb.full_h)
 
         hour = (6 + i) % 24
         seed = int(seed_base ^ nonce_seed ^ (i << 1) ^ hour) & 0xFFFFFFFF
         shapes = _generate_shapes(pb, sl, sr, stb, bool(pre_reader) and not is_senior, seed)
         _draw_shapes(c, shapes)
 
-        tri = sum(1 for s in shapes if s.kind == "triangle")
-        sq  = sum(1 for s in shapes if s.kind == "square")
-        st_ = sum(1 for s in shapes if s.kind == "star")
+        tri, sq, st_ = np.bincount(shapes.kind, minlength=3).tolist()
         t_shapes = len(shapes)
 
-        q = schedule[hour]
+        q = schedule[i]
         zone = _get_zone_for_hour(hour)
 
         # SENIOR
@@ -982,12 +1202,11 @@ def build_interior(name, uploads, kdp, debug, preflight, paper, eddie, style, pr
         _draw_quest_overlay(c, pb, sl, sr, stb, hour, mission, bool(debug), bool(pre_reader), bool(is_senior))
 
         if eddie:
-            _draw_eddie(c, pb.full_w - sr - 0.18 * inch, stb + 0.18 * inch, 0.18 * inch, style=style)
+            _draw_eddie_mark(c, pb.full_w - sr - 0.18 * inch, stb + 0.18 * inch, 0.18 * inch, style=style)
 
         _imprint_nonce(c, build_nonce)
         c.showPage()
         current_page_idx += 1
-        gc.collect()
 
     # OUTRO PAGE (CTA + QR)
     sl, sr, stb = safe_margins_for_page(total, bool(kdp), current_page_idx, pb)
@@ -995,43 +1214,20 @@ def build_interior(name, uploads, kdp, debug, preflight, paper, eddie, style, pr
     c.rect(0, 0, pb.full_w, pb.full_h, fill=1, stroke=0)
 
     _draw_eddie(c, pb.full_w / 2, pb.full_h - stb - 1.5 * inch, 0.8 * inch, style=style)
-
-    c.setFillColor(INK_BLACK)
-    _set_font(c, True, 24)
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 2.8 * inch, "Dieses Buch wurde generiert.")
-
-    _set_font(c, False, 14)
-    c.setFillColor(INK_GRAY_70)
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 3.4 * inch, "Mit E.P.E. — Eddie's Print Engine.")
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 3.7 * inch, "Aus ganz normalen Fotos.")
-
-    c.setFillColor(INK_BLACK)
-    _set_font(c, True, 15)
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 4.6 * inch, "1. Eigene Fotos hochladen.")
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 5.0 * inch, "2. Quests & Layout werden automatisch gebaut.")
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 5.4 * inch, "3. Als KDP-ready PDF herunterladen.")
-
-    qr_code = qr.QrCodeWidget(QR_URL)
-    bounds = qr_code.getBounds()
-    qr_w = bounds[2] - bounds[0]
-    qr_h = bounds[3] - bounds[1]
-    qr_size = 1.85 * inch
-    scale = qr_size / max(qr_w, qr_h)
-    d = Drawing(qr_size, qr_size, transform=[scale, 0, 0, scale, -bounds[0] * scale, -bounds[1] * scale])
-    d.add(qr_code)
-    renderPDF.draw(d, c, (pb.full_w - qr_size) / 2, pb.full_h - stb - 7.65 * inch)
-
-    c.setFillColor(INK_BLACK)
-    _set_font(c, True, 12)
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 8.05 * inch, QR_TEXT)
-
-    _set_font(c, False, 11)
-    c.setFillColor(INK_GRAY_70)
-    c.drawCentredString(pb.full_w / 2, pb.full_h - stb - 8.45 * inch, "3 kostenlose Bücher testen.")
-
-    _set_font(c, True, 12)
-    c.setFillColor(INK_BLACK)
-    c.drawCentredString(pb.full_w / 2, stb + 1.05 * inch, "Kein Abo. Keine Anmeldung. Nur das Tool.")
+    renderPDF.draw(_QR_DRAWING, c, (pb.full_w - QR_SIZE) / 2, pb.full_h - stb - 7.65 * inch)
+
+    top = pb.full_h - stb
+    _draw_centred_block(c, pb.full_w / 2, [
+        (True, 24, INK_BLACK, top - 2.8 * inch, "Dieses Buch wurde generiert."),
+        (False, 14, INK_GRAY_70, top - 3.4 * inch, "Mit E.P.E. — Eddie's Print Engine."),
+        (False, 14, INK_GRAY_70, top - 3.7 * inch, "Aus ganz normalen Fotos."),
+        (True, 15, INK_BLACK, top - 4.6 * inch, "1. Eigene Fotos hochladen."),
+        (True, 15, INK_BLACK, top - 5.0 * inch, "2. Quests & Layout werden automatisch gebaut."),
+        (True, 15, INK_BLACK, top - 5.4 * inch, "3. Als KDP-ready PDF herunterladen."),
+        (True, 12, INK_BLACK, top - 8.05 * inch, QR_TEXT),
+        (False, 11, INK_GRAY_70, top - 8.45 * inch, "3 kostenlose Bücher testen."),
+        (True, 12, INK_BLACK, stb + 1.05 * inch, "Kein Abo. Keine Anmeldung. Nur das Tool."),
+    ])
 
     if debug:
         _draw_kdp_debug_guides(c, pb, sl, sr, stb)
@@ -1039,17 +1235,17 @@ def build_interior(name, uploads, kdp, debug, preflight, paper, eddie, style, pr
     _imprint_nonce(c, build_nonce)
     c.showPage()
 
-    c.save()
-    buf.seek(0)
-    return buf.getvalue()
+    pdf = c.getpdfdata()
+    # dels above drop the big buffers by refcount; one full collect per build, not per page
+    gc.collect()
+    return pdf
 
 def build_cover(name, paper, uploads, style, build_nonce, debug, preflight, is_senior) -> bytes:
     sw = max(float(KDP_PAGES_FIXED) * PAPER_FACTORS.get(paper, 0.002252) * inch, 0.001 * inch)
     sw = round(sw / (0.001 * inch)) * (0.001 * inch)
 
     cw, ch = (2 * TRIM) + sw + (2 * BLEED), TRIM + (2 * BLEED)
-    buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=(cw, ch))
+    c = canvas.Canvas(None, pagesize=(cw, ch))
     c.setTitle(f"{APP_TITLE} — Cover")
     c.setAuthor("Eddies World")
     if build_nonce:
@@ -1066,6 +1262,7 @@ def build_cover(name, paper, uploads, style, build_nonce, debug, preflight, is_s
     spine_x = BLEED + TRIM
     front_x = BLEED + TRIM + sw
 
+    gen = _name_genitive(name)  # spine + front title
     book_title_cov = "TAGESBEGLEITER" if is_senior else "ABENTEUERBUCH"
     subtitle_cov = "24 Impulse • 24 Stunden • KDP-ready" if is_senior else "24 Missionen • 24 Stunden • KDP-ready"
 
@@ -1076,7 +1273,7 @@ def build_cover(name, paper, uploads, style, build_nonce, debug, preflight, is_s
         _set_font(c, True, 10)
         c.translate(BLEED + TRIM + sw / 2, BLEED + TRIM / 2)
         c.rotate(90)
-        c.drawCentredString(0, -4, f"{_name_genitive(name)} {book_title_cov}".upper())
+        c.drawCentredString(0, -4, f"{gen} {book_title_cov}".upper())
         c.restoreState()
 
     # BACK
@@ -1102,7 +1299,6 @@ def build_cover(name, paper, uploads, style, build_nonce, debug, preflight, is_s
         c.setLineWidth(1)
         c.roundRect(fx + TRIM * 0.10, BLEED + TRIM * 0.74, TRIM * 0.80, TRIM * 0.20, TRIM * 0.04, fill=1, stroke=1)
 
-    gen = _name_genitive(name)
     c.setFillColor(INK_BLACK)
     _set_font(c, True, 30)
     c.drawCentredString(fx + TRIM / 2, BLEED + TRIM * 0.88, f"{gen}")
@@ -1133,9 +1329,7 @@ def build_cover(name, paper, uploads, style, build_nonce, debug, preflight, is_s
     if build_nonce:
         _imprint_nonce(c, build_nonce)
 
-    c.save()
-    buf.seek(0)
-    return buf.getvalue()
+    return c.getpdfdata()
 
 # =========================================================
 # UI
@@ -1189,8 +1383,12 @@ def _uploads_sig(ul) -> str:
                 h.update(getattr(up, "name", "x").encode("utf-8", "ignore"))
                 continue
             h.update(len(buf).to_bytes(8, "little"))
-            data = bytes(buf[:2048]) + bytes(buf[-2048:]) if len(buf) > 4096 else bytes(buf)
-            h.update(hashlib.sha256(data).digest())
+            # head + tail fed straight from the memoryview: same digest as hashing the
+            # concatenation, without two slice copies and a third for the join
+            part = hashlib.sha256(buf[:2048] if len(buf) > 4096 else buf)
+            if len(buf) > 4096:
+                part.update(buf[-2048:])
+            h.update(part.digest())
         except Exception:
             b = _read_upload_bytes(up)
             h.update(len(b).to_bytes(8, "little"))
@@ -1223,6 +1421,7 @@ with st.container(border=True):
     with st.expander("⚙️ Erweiterte KDP & Druck-Einstellungen"):
         kdp = st.toggle("KDP Mode (Beschnittzugabe aktivieren)", True)
         eddie_guide = st.toggle("Eddie-Marke auf jeder Seite drucken", True)
+        pencil = st.toggle("✏️ Bleistift-Look (Graustufen statt klarer Linien)", False, help="Weichere Skizze mit Grautönen – schön zum Anschauen, weniger zum Ausmalen.")
         debug = st.toggle("🛠️ Preflight Debug (Rote Linien - NICHT drucken!)", False)
         preflight = st.toggle("📏 Preflight Mode (derzeit nur Cover-Barcodebox)", False)
 
@@ -1249,8 +1448,11 @@ if st.button("🚀 BUCH GENERIEREN", disabled=not (uploads and name), type="prim
         st.session_state["wash_cache"].clear()
 
     with st.spinner("Engine läuft... (Waschen, Skizzieren, Shapes, Layouten)"):
+        new_assets = {"name": name, "nonce": nonce}
         try:
-            int_pdf = build_interior(
+            # each PDF goes to disk as soon as it is built: the interior bytes are released
+            # before the cover is rendered, so both books are never in memory at once
+            new_assets["int"] = store_asset(build_interior(
                 name=name,
                 uploads=uploads,
                 kdp=bool(kdp),
@@ -1261,9 +1463,10 @@ if st.button("🚀 BUCH GENERIEREN", disabled=not (uploads and name), type="prim
                 style=str(eddie_style),
                 pre_reader=bool(pre_reader_mode),
                 build_nonce=nonce,
-                is_senior=is_senior
-            )
-            cov_pdf = build_cover(
+                is_senior=is_senior,
+                pencil=bool(pencil),
+            ), f"Int_{nonce}.pdf")
+            new_assets["cov"] = store_asset(build_cover(
                 name=name,
                 paper=str(paper),
                 uploads=uploads,
@@ -1272,20 +1475,27 @@ if st.button("🚀 BUCH GENERIEREN", disabled=not (uploads and name), type="prim
                 debug=bool(debug),
                 preflight=bool(preflight),
                 is_senior=is_senior
-            )
-            st.session_state.assets = {"int": int_pdf, "cov": cov_pdf, "name": name, "nonce": nonce}
+            ), f"Cov_{nonce}.pdf")
+            drop_assets(st.session_state.assets)
+            st.session_state.assets = new_assets
 
             _log_build(client_ip)
             st.success(f"🎉 Assets bereit! (Noch {max(0, builds_left - 1)} kostenlose Builds in den letzten 24h)")
         except Exception as e:
+            if st.session_state.assets is not new_assets:
+                drop_assets(new_assets)  # half-finished build: no orphaned interior file
             st.error(f"⚠️ Engine gestolpert: `{str(e)}`")
 
 if st.session_state.assets:
     a = st.session_state.assets
     st.markdown("### 📥 Deine druckfertigen PDFs")
     col1, col2 = st.columns(2)
-    col1.download_button("📘 Innenseiten (PDF)", a["int"], f"Int_{a['name']}.pdf", use_container_width=True)
-    col2.download_button("🎨 Cover (PDF)", a["cov"], f"Cov_{a['name']}.pdf", use_container_width=True)
+    try:
+        with open(a["int"], "rb") as f_int, open(a["cov"], "rb") as f_cov:
+            col1.download_button("📘 Innenseiten (PDF)", f_int, f"Int_{a['name']}.pdf", use_container_width=True)
+            col2.download_button("🎨 Cover (PDF)", f_cov, f"Cov_{a['name']}.pdf", use_container_width=True)
+    except OSError:
+        st.warning("PDFs sind abgelaufen (temporärer Speicher geleert). Bitte neu generieren.")
     st.caption(f"Security Nonce: `{a.get('nonce','')}`")
 
     if access_mode == "Free" and not is_supporter:
@@ -16,6 +16,7 @@ import gc
 import tempfile
 import hashlib
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Tuple
 from collections import OrderedDict
 
@@ -34,6 +35,8 @@ from reportlab.pdfbase.pdfmetrics import stringWidth
 
 # --- Upload sanitizer (must expose wash_image_bytes(b: bytes) -> bytes) ---
 import image_wash as iw
+from asset_store import store_asset, drop_assets  # finished PDFs on disk, age-swept
+from pdf_images import draw_page_image  # sketches as 1-bit / DCT XObjects
 
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
@@ -138,16 +141,24 @@ def _set_font(c: canvas.Canvas, bold: bool, size: int, leading: Optional[float]
     c.setFont(FONTS["bold"] if bold else FONTS["normal"], size)
     return float(leading if leading is not None else size * 1.22)
 
+# stringWidth is pure in (text, font, size); the autoscale loop re-wraps the same mission
+# texts at several sizes, so both the widths and whole wraps repeat across pages/builds.
+_sw = lru_cache(maxsize=8192)(stringWidth)
+
 def _wrap_text_hard(text: str, font: str, size: int, max_w: float) -> List[str]:
-    text = (text or "").strip()
+    return list(_wrap_text_cached(text or "", font, size, max_w))
+
+@lru_cache(maxsize=2048)
+def _wrap_text_cached(text: str, font: str, size: int, max_w: float) -> Tuple[str, ...]:
+    text = text.strip()
     if not text:
-        return [""]
+        return ("",)
     words = text.split()
     lines: List[str] = []
     cur = ""
 
     def fits(s: str) -> bool:
-        return stringWidth(s, font, size) <= max_w
+        return _sw(s, font, size) <= max_w
 
     for w in words:
         trial = (cur + " " + w).strip()
@@ -158,22 +169,23 @@ def _wrap_text_hard(text: str, font: str, size: int, max_w: float) -> List[str]:
         else:
             if cur:
                 lines.append(cur)
-            if not fits(w):
-                chunk = ""
-                for ch in w:
-                    if fits(chunk + ch):
-                        chunk += ch
+            # overlong word: split at the longest fitting prefix (binary search, widths are
+            # monotone in prefix length) instead of re-measuring after every character
+            while len(w) > 1 and not fits(w):
+                lo, hi = 1, len(w) - 1
+                while lo < hi:
+                    mid = (lo + hi + 1) // 2
+                    if fits(w[:mid]):
+                        lo = mid
                     else:
-                        if chunk:
-                            lines.append(chunk)
-                        chunk = ch
-                cur = chunk
-            else:
-                cur = w
+                        hi = mid - 1
+                lines.append(w[:lo])
+                w = w[lo:]
+            cur = w
 
     if cur:
         lines.append(cur)
-    return lines
+    return tuple(lines)
 
 def _fit_lines(lines: List[str], max_lines: int) -> List[str]:
     if len(lines) <= max_lines:
@@ -254,6 +266,18 @@ def _draw_eddie(c: canvas.Canvas, cx: float, cy: float, r: float, style: str = "
 
     c.restoreState()
 
+def _draw_eddie_mark(c: canvas.Canvas, cx: float, cy: float, r: float, style: str = "tongue"):
+    # per-page guide mark: drawn once into a Form XObject (origin = centre), pages only "Do" it
+    name = f"Eddie_{style}_{int(round(r * 1000))}"
+    if not c.hasForm(name):
+        c.beginForm(name, lowerx=-r - 4, lowery=-r - 4, upperx=r + 4, uppery=r + 4)
+        _draw_eddie(c, 0, 0, r, style=style)
+        c.endForm()
+    c.saveState()
+    c.translate(cx, cy)
+    c.doForm(name)
+    c.restoreState()
+
 # =========================================================
 # PRE-READER ICONS
 # =========================================================
@@ -305,40 +329,53 @@ def _wash_upload_to_bytes(up) -> bytes:
 # SKETCH CACHE
 # =========================================================
 def _sketch_compute(img_bytes: bytes, target_w: int, target_h: int) -> bytes:
-    arr = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_COLOR)
-    if arr is None:
-        raise RuntimeError("OpenCV decode failed (arr=None)")
-
-    gray = cv2.cvtColor(arr, cv2.COLOR_BGR2GRAY)
-    inverted = 255 - gray
-    blurred = cv2.GaussianBlur(inverted, (21, 21), 0)
-    denom = np.clip(255 - blurred, 1, 255)
-    sketch = cv2.divide(gray, denom, scale=256.0)
-    norm = cv2.normalize(sketch, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
-
-    pil = Image.fromarray(norm).convert("L")
-    sw, sh = pil.size
-    s = min(sw, sh)
-    pil = pil.crop(((sw - s) // 2, (sh - s) // 2, (sw + s) // 2, (sh + s) // 2))
-    pil = pil.resize((target_w, target_h), Image.LANCZOS)
-    pil_1bit = pil.point(lambda p: 255 if p > 200 else 0).convert("1")
-
-    out = io.BytesIO()
-    pil_1bit.save(out, format="PNG", optimize=True)
-    outv = out.getvalue()
-
-    del arr, gray, inverted, blurred, denom, sketch, norm, pil, pil_1bit
-    gc.collect()
-    return outv
-
-def _get_sketch_cached(img_bytes: bytes, target_w: int, target_h: int) -> bytes:
+    # libjpeg/libpng decode straight to 8-bit gray: a third of the pixels, no BGR2GRAY pass
+    gray = cv2.imdecode(np.frombuffer(img_bytes, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise RuntimeError("OpenCV decode failed (gray=None)")
+
+    # center crop (view) + INTER_AREA downsample first -> blur/divide run at page resolution
+    h_arr, w_arr = gray.shape
+    s = min(w_arr, h_arr)
+    gray = gray[(h_arr - s) // 2:(h_arr - s) // 2 + s, (w_arr - s) // 2:(w_arr - s) // 2 + s]
+    scale = max(target_w, target_h) / s
+    k = 21
+    if scale < 1.0:
+        gray = cv2.resize(gray, (target_w, target_h), interpolation=cv2.INTER_AREA)
+        k = max(3, int(round(21 * scale)) | 1)
+
+    # dodge blend fused into one scratch buffer (dst=): ~gray -> blur -> ~ -> max(1) -> divide -> minmax
+    norm = cv2.GaussianBlur(cv2.bitwise_not(gray), (k, k), 0)
+    cv2.bitwise_not(norm, dst=norm)
+    cv2.max(norm, 1, dst=norm)
+    cv2.divide(gray, norm, dst=norm, scale=256.0)
+    # min/max from a 1/64 strided sample, then one saturating scale pass (convertScaleAbs)
+    # instead of NORM_MINMAX's two full sweeps; skipped when the sample already spans 0..255
+    sub = norm[::8, ::8]
+    lo, hi = int(sub.min()), int(sub.max())
+    if hi > lo and (lo, hi) != (0, 255):
+        cv2.convertScaleAbs(norm, dst=norm, alpha=255.0 / (hi - lo), beta=-lo * 255.0 / (hi - lo))
+
+    if norm.shape[::-1] != (target_w, target_h):  # upscaling a small photo
+        # bilinear: output is thresholded to 1-bit right after, LANCZOS only adds cost + ringing
+        norm = cv2.resize(norm, (target_w, target_h), interpolation=cv2.INTER_LINEAR)
+    # threshold + 1-bit PNG entirely in OpenCV: no PIL copies, no per-pixel Python callback;
+    # the PNG is only the cache format, pages embed the unpacked bits (pdf_images.BilevelImage)
+    cv2.threshold(norm, 200, 255, cv2.THRESH_BINARY, dst=norm)
+    ok, enc = cv2.imencode(".png", norm, [cv2.IMWRITE_PNG_BILEVEL, 1, cv2.IMWRITE_PNG_COMPRESSION, 3])
+    if not ok:
+        raise RuntimeError("OpenCV sketch encode failed")
+    return enc.tobytes()
+
+def _get_sketch_cached(up, target_w: int, target_h: int) -> bytes:
+    # keyed on the RAW upload + size: a hit skips the wash too (repeated pages, cover, reruns)
     cache: "OrderedDict[Tuple[str,int,int], bytes]" = st.session_state.setdefault("sketch_cache", OrderedDict())
-    h = hashlib.sha256(img_bytes).hexdigest()
+    h = hashlib.sha256(_upload_to_bytes(up)).hexdigest()
     key = (h, int(target_w), int(target_h))
     if key in cache:
         cache.move_to_end(key)
         return cache[key]
-    out = _sketch_compute(img_bytes, target_w, target_h)
+    out = _sketch_compute(_wash_upload_to_bytes(up), target_w, target_h)
     cache[key] = out
     cache.move_to_end(key)
     while len(cache) > MAX_SKETCH_CACHE:
@@ -493,8 +530,7 @@ def _cover_collage_png(uploads, size_px: int, seed: int) -> Optional[bytes]:
                 break
             up = pick[k]; k += 1
             try:
-                washed = _wash_upload_to_bytes(up)
-                sk = _sketch_compute(washed, cell, cell)
+                sk = _get_sketch_cached(up, cell, cell)
                 tile = Image.open(io.BytesIO(sk)).convert("L")
             except Exception:
                 tile = Image.new("L", (cell, cell), 255)
@@ -503,12 +539,12 @@ def _cover_collage_png(uploads, size_px: int, seed: int) -> Optional[bytes]:
             y = gap + r * (cell + gap)
             canvas_img.paste(tile, (x, y))
             del tile
-            gc.collect()
 
     d = ImageDraw.Draw(canvas_img)
     d.rectangle([0, 0, size_px-1, size_px-1], outline=0, width=max(2, size_px // 250))
     out = io.BytesIO()
-    canvas_img.save(out, format="PNG", optimize=True)
+    # intermediate only (drawImage decodes and re-Flates it): fastest zlib level, no optimize pass
+    canvas_img.save(out, format="PNG", compress_level=1)
     return out.getvalue()
 
 # =========================================================
@@ -534,8 +570,7 @@ def build_interior(
     photo_count = max(1, pages - (int(intro) + int(outro)))
     final = (files * (photo_count // len(files) + 1))[:photo_count]
 
-    buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=(pb.full_w, pb.full_h))
+    c = canvas.Canvas(None, pagesize=(pb.full_w, pb.full_h))
 
     seed_base = _stable_seed(name)
     target_w = int(pb.full_w * DPI / inch)
@@ -555,11 +590,12 @@ def build_interior(
         page_idx += 1
 
     # Content
+    # one 1-bit image XObject per unique sketch, repeated photos are a single "/sk_n Do"
+    names: Dict[bytes, str] = {}
     for i, up in enumerate(final):
-        washed_bytes = _wash_upload_to_bytes(up)
-        png_bytes = _get_sketch_cached(washed_bytes, target_w, target_h)
-
-        c.drawImage(ImageReader(io.BytesIO(png_bytes)), 0, 0, pb.full_w, pb.full_h)
+        png_bytes = _get_sketch_cached(up, target_w, target_h)
+        name_ = names.setdefault(png_bytes, f"sk_{len(names)}")
+        draw_page_image(c, name_, png_bytes, 0, 0, pb.full_w, pb.full_h)
 
         sl, sr, stb = safe_margins_for_page(pages, kdp, page_idx, pb)
         h_val = (start_hour + i) % 24
@@ -570,13 +606,11 @@ def build_interior(
 
         # guide mark bottom-right (small)
         r = 0.18 * inch
-        _draw_eddie(c, (pb.full_w - sr) - r, stb + r, r, style=eddie_style)
+        _draw_eddie_mark(c, (pb.full_w - sr) - r, stb + r, r, style=eddie_style)
 
         c.showPage()
         page_idx += 1
-
-        del washed_bytes, png_bytes
-        gc.collect()
+        del png_bytes
 
     # Outro
     if outro:
@@ -587,9 +621,11 @@ def build_interior(
         c.drawCentredString(pb.full_w / 2, pb.full_h / 2 - 1.5 * inch, "Quest abgeschlossen!")
         c.showPage()
 
-    c.save()
-    buf.seek(0)
-    return buf.getvalue()
+    # getpdfdata serialises straight to bytes, no BytesIO copy next to the result
+    pdf = c.getpdfdata()
+    # dels above drop the big buffers by refcount; one full collect per build, not per page
+    gc.collect()
+    return pdf
 
 def build_cover(name: str, pages: int, paper: str, uploads, eddie_style: str) -> bytes:
     sw = float(pages) * PAPER_FACTORS.get(paper, 0.002252) * inch
@@ -597,8 +633,7 @@ def build_cover(name: str, pages: int, paper: str, uploads, eddie_style: str) ->
     sw = round(sw / (0.001 * inch)) * (0.001 * inch)
     cw, ch = (2 * TRIM) + sw + (2 * BLEED), TRIM + (2 * BLEED)
 
-    buf = io.BytesIO()
-    c = canvas.Canvas(buf, pagesize=(cw, ch))
+    c = canvas.Canvas(None, pagesize=(cw, ch))
 
     # base
     c.setFillColor(colors.white)
@@ -655,9 +690,7 @@ def build_cover(name: str, pages: int, paper: str, uploads, eddie_style: str) ->
     # brand mark (NO SMILEY)
     _draw_eddie(c, fx + TRIM / 2, BLEED + TRIM * 0.62, TRIM * 0.16, style=eddie_style)
 
-    c.save()
-    buf.seek(0)
-    return buf.getvalue()
+    return c.getpdfdata()
 
 # =========================================================
 # UI
@@ -708,7 +741,10 @@ if st.button("🚀 GENERIEREN", disabled=not can_build):
     with st.spinner("Waschen → Skizzieren → PDF bauen …"):
         diff = 1 if age <= 4 else 2 if age <= 6 else 3 if age <= 9 else 4
 
-        pdf_int = build_interior(
+        token = os.urandom(6).hex()
+        new_assets = {"name": name}
+        # each PDF goes to disk as soon as it is built, interior + cover are never both in RAM
+        new_assets["int"] = store_asset(build_interior(
             name=name,
             uploads=uploads,
             pages=int(pages),
@@ -719,16 +755,28 @@ if st.button("🚀 GENERIEREN", disabled=not can_build):
             diff=diff,
             eddie_style=eddie_style,
             pre_reader=bool(pre_reader_mode),
-        )
-        pdf_cov = build_cover(name=name, pages=int(pages), paper=str(paper), uploads=uploads, eddie_style=eddie_style)
-
-        st.session_state.assets = {"int": pdf_int, "cov": pdf_cov, "name": name}
+        ), f"Int_{token}.pdf")
+        try:
+            new_assets["cov"] = store_asset(
+                build_cover(name=name, pages=int(pages), paper=str(paper), uploads=uploads, eddie_style=eddie_style),
+                f"Cov_{token}.pdf",
+            )
+        except Exception:
+            drop_assets(new_assets)
+            raise
+
+        drop_assets(st.session_state.assets)
+        st.session_state.assets = new_assets
         st.success("✅ Fertig! PDFs sind bereit.")
 
 if st.session_state.assets:
     a = st.session_state.assets
     c1, c2 = st.columns(2)
-    c1.download_button("📘 Interior PDF", a["int"], file_name=f"Int_{a['name']}.pdf")
-    c2.download_button("🎨 Cover PDF", a["cov"], file_name=f"Cov_{a['name']}.pdf")
+    try:
+        with open(a["int"], "rb") as f_int, open(a["cov"], "rb") as f_cov:
+            c1.download_button("📘 Interior PDF", f_int, file_name=f"Int_{a['name']}.pdf")
+            c2.download_button("🎨 Cover PDF", f_cov, file_name=f"Cov_{a['name']}.pdf")
+    except OSError:
+        st.warning("PDFs sind abgelaufen (temporärer Speicher geleert). Bitte neu generieren.")
 
 st.markdown("<div style='text-align:center; color:grey;'>Eddies Welt © 2026</div>", unsafe_allow_html=True)
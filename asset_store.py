@@ -0,0 +1,48 @@
+# asset_store.py
+# ==========================================================
+# Finished PDFs on disk (shared by app.py + app_backup_logo_patch.py)
+# - the session only keeps paths: download_button already holds one in-memory
+#   copy per rerun, a second one in session_state is pure overhead
+# - sessions that never rebuild can't clean up after themselves, so every
+#   store sweeps files older than ASSET_TTL_S
+# ==========================================================
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+
+ASSET_DIR = os.path.join(tempfile.gettempdir(), "eddies_assets")
+ASSET_TTL_S = 6 * 3600
+
+
+def sweep_assets(max_age_s: float = ASSET_TTL_S) -> None:
+    cutoff = time.time() - max_age_s
+    try:
+        entries = list(os.scandir(ASSET_DIR))
+    except OSError:
+        return
+    for e in entries:
+        try:
+            if e.is_file() and e.stat().st_mtime < cutoff:
+                os.remove(e.path)
+        except OSError:
+            pass
+
+
+def store_asset(data: bytes, fname: str) -> str:
+    os.makedirs(ASSET_DIR, exist_ok=True)
+    sweep_assets()
+    path = os.path.join(ASSET_DIR, fname)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
+
+
+def drop_assets(a: Optional[Dict[str, str]]) -> None:
+    for k in ("int", "cov"):
+        try:
+            os.remove((a or {}).get(k, ""))
+        except OSError:
+            pass
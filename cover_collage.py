@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import io
+import os
 import hashlib
-from typing import List, Optional, Dict, Any, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Callable, List, Optional, Dict, Any, Tuple
 
 from PIL import Image, ImageOps
 from reportlab.pdfgen import canvas
@@ -20,49 +24,78 @@ def _stable_seed(s: str) -> int:
     return int.from_bytes(hashlib.sha256(s.encode("utf-8")).digest()[:8], "big")
 
 
-def _open_sanitized(img_bytes: bytes) -> Image.Image:
+def _open_sanitized(img_bytes: bytes, target_size: Optional[Tuple[int, int]] = None) -> Image.Image:
     if iw is not None and hasattr(iw, "wash_bytes_to_rgb"):
         return iw.wash_bytes_to_rgb(img_bytes)
 
     im = Image.open(io.BytesIO(img_bytes))
-    im = ImageOps.exif_transpose(im).convert("RGB")
-    out = io.BytesIO()
-    im.save(out, format="JPEG", quality=92, optimize=True, progressive=True)
-    out.seek(0)
-    return Image.open(out).convert("RGB")
+    if target_size and im.format == "JPEG":
+        # libjpeg DCT shrink-on-load (1/2..1/8); 2x the long target side on both axes keeps
+        # enough pixels for any crop/orientation, LANCZOS then runs on the smaller frame
+        m = 2 * max(target_size)
+        im.draft("RGB", (m, m))
+    # pixels only leave this module re-encoded (collage JPEG), so no metadata survives;
+    # the former JPEG save + reopen round-trip only cost time and quality
+    return ImageOps.exif_transpose(im).convert("RGB")
 
 
 def _pick_indices(n_total: int, need: int, seed: int, hero_first: bool) -> List[int]:
     if n_total <= 0:
         return []
-    out = []
-    if hero_first:
-        out.append(0)
-    i = 0
-    while len(out) < need:
+    out: List[int] = [0] if hero_first else []
+    seen = set(out)
+    # 9973 is prime (coprime to any smaller n_total): n_total steps visit every index once
+    for i in range(n_total):
+        if len(out) >= need:
+            break
         idx = (seed + i * 9973) % n_total
-        if idx not in out:
+        if idx not in seen:
+            seen.add(idx)
             out.append(idx)
-        i += 1
+    # fewer uploads than tiles: repeat the picked order instead of spinning forever
+    while len(out) < need:
+        out.extend(out[: need - len(out)])
     return out[:need]
 
 
-def _thumb_cached(
-    cache: Dict[Tuple[str, int, int], Image.Image],
-    img_bytes: bytes,
-    w: int,
-    h: int,
-) -> Image.Image:
-    hsh = hashlib.sha256(img_bytes).hexdigest()
-    key = (hsh, w, h)
-    if key in cache:
-        return cache[key]
-    im = _open_sanitized(img_bytes)
-    im = ImageOps.fit(im, (w, h), method=Image.LANCZOS, centering=(0.5, 0.5))
-    cache[key] = im
-    # cap cache size (simple LRU-ish by pop oldest insertion)
-    if len(cache) > 96:
-        cache.pop(next(iter(cache)))
+def _fit_center(im: Image.Image, w: int, h: int) -> Image.Image:
+    # same centred crop as ImageOps.fit, but reducing_gap lets Pillow box-reduce by an
+    # integer factor first, so LANCZOS only runs on ~2x the target size, not the full photo
+    sw, sh = im.size
+    if sw * h > sh * w:
+        cw = sh * w / h
+        box = ((sw - cw) / 2, 0, (sw + cw) / 2, sh)
+    else:
+        chh = sw * h / w
+        box = (0, (sh - chh) / 2, sw, (sh + chh) / 2)
+    return im.resize((w, h), Image.LANCZOS, box=box, reducing_gap=2.0)
+
+
+# module-level LRU: survives across build_cover_collage calls (reruns reuse the same uploads);
+# bounded by decoded RGB bytes since a hero tile is ~8x a grid tile. Shared by all sessions.
+_THUMB_CACHE: "OrderedDict[Tuple[str, int, int], Image.Image]" = OrderedDict()
+_THUMB_CACHE_MAX_BYTES = 128 * 1024 * 1024
+_thumb_cache_bytes = 0
+_thumb_lock = threading.Lock()
+
+
+def _thumb_cached(digest: str, load: Callable[[], bytes], w: int, h: int) -> Image.Image:
+    # digest precomputed by the caller; the upload bytes are only fetched on a miss
+    global _thumb_cache_bytes
+    key = (digest, w, h)
+    with _thumb_lock:
+        im = _THUMB_CACHE.get(key)
+        if im is not None:
+            _THUMB_CACHE.move_to_end(key)
+            return im
+    im = _fit_center(_open_sanitized(load(), (w, h)), w, h)
+    with _thumb_lock:
+        if key not in _THUMB_CACHE:
+            _THUMB_CACHE[key] = im
+            _thumb_cache_bytes += w * h * 3
+        while _thumb_cache_bytes > _THUMB_CACHE_MAX_BYTES and len(_THUMB_CACHE) > 1:
+            (_, ow, oh), _ = _THUMB_CACHE.popitem(last=False)
+            _thumb_cache_bytes -= ow * oh * 3
     return im
 
 
@@ -74,7 +107,6 @@ def _render_template(
     hero_first: bool,
 ) -> Image.Image:
     seed = _stable_seed(seed_str)
-    cache: Dict[Tuple[str, int, int], Image.Image] = {}
 
     # canvas size (square)
     W = 2400
@@ -86,55 +118,50 @@ def _render_template(
         up = uploads[i]
         return up.getvalue() if hasattr(up, "getvalue") else bytes(up)
 
+    digests: Dict[int, str] = {}  # filled on this thread before the pool starts; workers only read
+    def thumb(i: int, w: int, h: int) -> Image.Image:
+        return _thumb_cached(digests[i], lambda: get_bytes(i), w, h)
+
     if n_total == 0:
         return bg
 
+    # tiles as (upload idx, x, y, w, h); heroes come out of _fit_center at exactly (w, h)
+    tiles: List[Tuple[int, int, int, int, int]] = []
     if template == "GRID_3":
         grid, tile, gap = 3, 720, 18
-        need = grid * grid
-        idxs = _pick_indices(n_total, need, seed, hero_first)
-        k = 0
-        for r in range(grid):
-            for c in range(grid):
-                b = get_bytes(idxs[k]); k += 1
-                im = _thumb_cached(cache, b, tile, tile)
-                x = c * (tile + gap)
-                y = r * (tile + gap)
-                bg.paste(im, (x, y))
-        return bg
+        idxs = _pick_indices(n_total, grid * grid, seed, hero_first)
+        for k in range(grid * grid):
+            r, c = divmod(k, grid)
+            tiles.append((idxs[k], c * (tile + gap), r * (tile + gap), tile, tile))
 
-    if template == "HERO_STRIP":
+    elif template == "HERO_STRIP":
         # Big hero + bottom strip (5 tiles)
         idxs = _pick_indices(n_total, 1 + 5, seed, hero_first)
-        hero_b = get_bytes(idxs[0])
-        hero = _thumb_cached(cache, hero_b, W, int(W * 0.72))
-        bg.paste(hero, (0, 0))
-
-        strip_h = W - hero.size[1]
+        hero_h = int(W * 0.72)
+        tiles.append((idxs[0], 0, 0, W, hero_h))
         tile = int((W - 4 * 14) / 5)
-        y0 = hero.size[1]
         for j in range(5):
-            b = get_bytes(idxs[1 + j])
-            im = _thumb_cached(cache, b, tile, strip_h)
-            x = j * (tile + 14)
-            bg.paste(im, (x, y0))
-        return bg
-
-    # default: HERO_4 (hero + 4 tiles right column)
-    idxs = _pick_indices(n_total, 1 + 4, seed, hero_first)
-    hero_b = get_bytes(idxs[0])
-    hero = _thumb_cached(cache, hero_b, int(W * 0.72), W)
-    bg.paste(hero, (0, 0))
-
-    col_w = W - hero.size[0]
-    gap = 14
-    tile_h = int((W - 3 * gap) / 4)
-    for j in range(4):
-        b = get_bytes(idxs[1 + j])
-        im = _thumb_cached(cache, b, col_w, tile_h)
-        x0 = hero.size[0]
-        y0 = j * (tile_h + gap)
-        bg.paste(im, (x0, y0))
+            tiles.append((idxs[1 + j], j * (tile + 14), hero_h, tile, W - hero_h))
+
+    else:
+        # default: HERO_4 (hero + 4 tiles right column)
+        idxs = _pick_indices(n_total, 1 + 4, seed, hero_first)
+        hero_w = int(W * 0.72)
+        tiles.append((idxs[0], 0, 0, hero_w, W))
+        gap = 14
+        tile_h = int((W - 3 * gap) / 4)
+        for j in range(4):
+            tiles.append((idxs[1 + j], hero_w, j * (tile_h + gap), W - hero_w, tile_h))
+
+    # one SHA-256 per upload per collage, however many tiles/sizes it lands in
+    for i in {t[0] for t in tiles}:
+        digests[i] = hashlib.sha256(get_bytes(i)).hexdigest()
+
+    # tiles are independent: decode + fit run in a thread pool (libjpeg and the resample
+    # kernels drop the GIL); pasting into the shared canvas stays on this thread
+    with ThreadPoolExecutor(max_workers=min(len(tiles), os.cpu_count() or 1)) as ex:
+        for (_, x, y, _, _), im in zip(tiles, ex.map(lambda t: thumb(t[0], t[3], t[4]), tiles)):
+            bg.paste(im, (x, y))
     return bg
 
 
@@ -97,28 +97,32 @@ def _draw_maze(
         cy -= 1
         ch = ih / cy
 
-    # Internal walls
+    # Internal walls: one wall line per grid line, split only at its gap cell,
+    # all collected into a single path (one stroke op instead of a c.line per cell)
+    p = c.beginPath()
+    ys = [iy + j * ch for j in range(cy + 1)]
+    xs = [ix + i * cw for i in range(cx + 1)]
+
     # Vertical segments at each grid line i (1..cx-1)
     for i in range(1, cx):
         if rng.random() < wall_density:
             gap = rng.randint(0, cy - 1)
-            x0 = ix + i * cw
-            for j in range(cy):
-                if j == gap:
-                    continue
-                y0 = iy + j * ch
-                c.line(x0, y0, x0, y0 + ch)
+            x0 = xs[i]
+            if gap > 0:
+                p.moveTo(x0, ys[0]); p.lineTo(x0, ys[gap])
+            if gap < cy - 1:
+                p.moveTo(x0, ys[gap + 1]); p.lineTo(x0, ys[cy])
 
     # Horizontal segments at each grid line j (1..cy-1)
     for j in range(1, cy):
         if rng.random() < wall_density:
             gap = rng.randint(0, cx - 1)
-            y0 = iy + j * ch
-            for i in range(cx):
-                if i == gap:
-                    continue
-                x0 = ix + i * cw
-                c.line(x0, y0, x0 + cw, y0)
+            y0 = ys[j]
+            if gap > 0:
+                p.moveTo(xs[0], y0); p.lineTo(xs[gap], y0)
+            if gap < cx - 1:
+                p.moveTo(xs[gap + 1], y0); p.lineTo(xs[cx], y0)
+    c.drawPath(p, stroke=1, fill=0)
 
     # Start/End markers (inside padding)
     _set_text(c)
@@ -142,11 +146,9 @@ def _draw_maze(
 _SHAPES = ("KREIS", "QUADRAT", "DREIECK")
 
 
-def _draw_triangle(c: canvas.Canvas, cx: float, cy: float, r: float):
-    # Equilateral-ish
-    c.line(cx, cy + r, cx - r, cy - r)
-    c.line(cx - r, cy - r, cx + r, cy - r)
-    c.line(cx + r, cy - r, cx, cy + r)
+def _draw_triangle(p, cx: float, cy: float, r: float):
+    # Equilateral-ish (p = PDFPathObject)
+    p.moveTo(cx, cy + r); p.lineTo(cx - r, cy - r); p.lineTo(cx + r, cy - r); p.lineTo(cx, cy + r)
 
 
 def _draw_seek_objects(
@@ -181,17 +183,21 @@ def _draw_seek_objects(
     x1 = x + w - pad
     y1 = y + h - pad
 
-    for _ in range(max(1, int(icons_count))):
-        sx = x0 + rng.random() * max(1.0, (x1 - x0))
-        sy = y0 + rng.random() * max(1.0, (y1 - y0))
-        t = rng.choice(_SHAPES)
+    # draws in the same rng order as before (x, y, shape per icon), ranges hoisted;
+    # every icon goes into one path -> a single stroke op
+    rw = max(1.0, (x1 - x0))
+    rh = max(1.0, (y1 - y0))
+    icons = [(x0 + rng.random() * rw, y0 + rng.random() * rh, rng.choice(_SHAPES)) for _ in range(max(1, int(icons_count)))]
 
+    p = c.beginPath()
+    for sx, sy, t in icons:
         if t == "KREIS":
-            c.circle(sx, sy, icon_r, stroke=1, fill=0)
+            p.circle(sx, sy, icon_r)
         elif t == "QUADRAT":
-            c.rect(sx - icon_r, sy - icon_r, 2 * icon_r, 2 * icon_r, stroke=1, fill=0)
+            p.rect(sx - icon_r, sy - icon_r, 2 * icon_r, 2 * icon_r)
         else:
-            _draw_triangle(c, sx, sy, icon_r)
+            _draw_triangle(p, sx, sy, icon_r)
+    c.drawPath(p, stroke=1, fill=0)
 
 
 # -----------------------------
@@ -1,22 +1,30 @@
 ﻿from __future__ import annotations
 import io
+from typing import Optional
 from PIL import Image, ImageOps, ImageFile
 
 ImageFile.LOAD_TRUNCATED_IMAGES = True
 
-def wash_image_bytes(raw: bytes) -> bytes:
+def wash_image_bytes(raw: bytes, max_short_side: Optional[int] = None) -> bytes:
     if not raw:
         raise ValueError("empty upload")
 
     with Image.open(io.BytesIO(raw)) as im:
         im = ImageOps.exif_transpose(im)
+        # downstream only ever needs max_short_side px on the short side (square crop):
+        # shrink first so convert + PNG encode run on the smaller frame
+        if max_short_side and min(im.size) > max_short_side:
+            f = max_short_side / min(im.size)
+            im = im.resize((max(1, round(im.width * f)), max(1, round(im.height * f))), Image.BOX)
         if im.mode not in ("RGB", "L"):
             im = im.convert("RGB")
         elif im.mode == "L":
             im = im.convert("RGB")
         
         out = io.BytesIO()
-        im.save(out, format="PNG", optimize=True)
+        # lossless handoff to the sketch decoder: optimize=True retries every filter/zlib combo
+        # (~17s on a 12MP photo), level 3 is ~20x faster at ~30% more bytes
+        im.save(out, format="PNG", compress_level=3)
         return out.getvalue()
 
 def wash_bytes(raw: bytes) -> bytes:
@@ -7,7 +7,9 @@ from typing import Dict, Any, List, Optional, Tuple
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
+from reportlab.graphics.barcode import qr
+from reportlab.graphics.shapes import Drawing
+from reportlab.graphics import renderPDF
 
 from kern.pdf_engine import (
     get_page_spec,
@@ -16,12 +18,6 @@ from kern.pdf_engine import (
     draw_icon,
 )
 
-# qrcode ist optional (Streamlit Cloud / requirements können variieren)
-try:
-    import qrcode  # type: ignore
-except Exception:  # pragma: no cover
-    qrcode = None
-
 
 # -----------------------------
 # Policy (6er Grid, A4)
@@ -138,26 +134,21 @@ def _pick_example_for_word(word_item: Dict[str, str], legacy: Dict[str, Any]) ->
     return f"Ich übe das Wort: {w}."
 
 
-def _make_qr_image_bytes(payload: str) -> Optional[bytes]:
+def _make_qr_drawing(payload: str, size: float) -> Optional[Drawing]:
     """
-    Returns PNG bytes if qrcode is available, else None (offline-safe fallback).
+    Vektor-QR über ReportLab (kein qrcode-Paket, kein PNG encode/decode).
+    Returns None, wenn der Payload nicht kodierbar ist (Fallback-Placeholder).
     """
-    if qrcode is None:
+    try:
+        widget = qr.QrCodeWidget(payload, barLevel="M", barBorder=2)
+        b = widget.getBounds()
+    except Exception:
         return None
 
-    qr = qrcode.QRCode(
-        version=None,
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=6,
-        border=2,
-    )
-    qr.add_data(payload)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-
-    bio = io.BytesIO()
-    img.save(bio, format="PNG")
-    return bio.getvalue()
+    scale = size / max(b[2] - b[0], b[3] - b[1])
+    d = Drawing(size, size, transform=[scale, 0, 0, scale, -b[0] * scale, -b[1] * scale])
+    d.add(widget)
+    return d
 
 
 def _draw_qr_fallback(
@@ -170,7 +161,7 @@ def _draw_qr_fallback(
     payload: str,
 ) -> None:
     """
-    Fallback wenn qrcode nicht installiert ist: stiller Placeholder, kein Crash.
+    Fallback wenn der QR nicht erzeugt werden kann: stiller Placeholder, kein Crash.
     """
     c.saveState()
     c.setStrokeColor(colors.Color(0, 0, 0, alpha=0.35))
@@ -185,7 +176,7 @@ def _draw_qr_fallback(
     # Hinweis klein
     c.setFont("Helvetica", 8)
     c.setFillColor(colors.Color(0, 0, 0, alpha=0.55))
-    c.drawCentredString(x + w / 2, y + 6, "qrcode nicht installiert")
+    c.drawCentredString(x + w / 2, y + 6, "QR nicht verfügbar")
 
     # Payload (sehr kurz)
     short = payload.replace("\n", " • ").strip()
@@ -365,7 +356,6 @@ def export_trainer_cards(
             sentence = _pick_example_for_word(it, legacy)
 
             payload = f"{word}\n{sentence}".strip()
-            qr_png = _make_qr_image_bytes(payload)
 
             # QR Zone (unten)
             qr_zone_h = card_h * float(pol["back_qr_ratio"])
@@ -417,9 +407,9 @@ def export_trainer_cards(
             q_dx = qr_x + (qr_w - q_size) / 2
             q_dy = qr_y + (qr_h - q_size) / 2
 
-            if qr_png:
-                qr_reader = ImageReader(io.BytesIO(qr_png))
-                c.drawImage(qr_reader, q_dx, q_dy, width=q_size, height=q_size, mask="auto")
+            qr_drawing = _make_qr_drawing(payload, q_size)
+            if qr_drawing is not None:
+                renderPDF.draw(qr_drawing, c, q_dx, q_dy)
             else:
                 _draw_qr_fallback(c, x=q_dx, y=q_dy, w=q_size, h=q_size, payload=payload)
 
@@ -0,0 +1,82 @@
+# pdf_images.py
+# ==========================================================
+# Page sketches as direct PDF image XObjects (shared by app.py + app_backup_logo_patch.py)
+# - ReportLab expands every ImageReader to 8-bit RGB (3 bytes/px + A85) before Flate
+# - line sketches are pure black/white -> 1-bit DeviceGray rows packed from the mask
+# - pencil sketches are gray JPEGs -> their DCT bytes go in unchanged
+#
+# The direct path needs ReportLab canvas/document internals (no public API for
+# registering a prebuilt XObject). All private access lives in this file, is gated
+# on the tested 4.x line + hasattr checks, and falls back to plain drawImage.
+# ==========================================================
+from __future__ import annotations
+
+import io
+import zlib
+
+import cv2
+import numpy as np
+import reportlab
+from reportlab.pdfbase import pdfdoc
+from reportlab.pdfgen import canvas
+from reportlab.lib.utils import ImageReader
+
+_DOC_ATTRS = ("getXObjectName", "idToObject", "Reference", "addForm")
+_CANVAS_ATTRS = ("_doc", "_setXObjects", "_code", "_formsinuse")
+_RL_MAJOR_OK = reportlab.Version.split(".")[0] == "4"  # requirements pin reportlab 4.2.x
+
+
+class BilevelImage(pdfdoc.PDFImageXObject):
+    def __init__(self, name: str, bw: np.ndarray):
+        super().__init__(name)
+        self.height, self.width = bw.shape
+        self.bitsPerComponent = 1
+        self.colorSpace = "DeviceGray"  # 1 = white, 0 = black
+        self.streamContent = zlib.compress(np.packbits(bw > 127, axis=1).tobytes())
+        self._filters = ("FlateDecode",)
+
+
+def jpeg_xobject(name: str, jpeg_bytes: bytes) -> pdfdoc.PDFImageXObject:
+    img = pdfdoc.PDFImageXObject(name)
+    if not img.loadImageFromJPEG(io.BytesIO(jpeg_bytes)):
+        raise RuntimeError("JPEG header unreadable")
+    img.streamContent = jpeg_bytes
+    img._filters = ("DCTDecode",)  # raw stream, no ASCII85 inflation
+    return img
+
+
+def _direct_ok(c: canvas.Canvas) -> bool:
+    return (
+        _RL_MAJOR_OK
+        and all(hasattr(c, a) for a in _CANVAS_ATTRS)
+        and all(hasattr(c._doc, a) for a in _DOC_ATTRS)
+    )
+
+
+def draw_page_image(c: canvas.Canvas, name: str, data: bytes, x: float, y: float, w: float, h: float) -> None:
+    """Draw a sketch (gray JPEG or bilevel PNG bytes) at (x, y, w, h).
+
+    Embedded once per canvas under `name`; later pages only reference the XObject.
+    """
+    if not _direct_ok(c):
+        # public API: bigger (RGB + A85) but still deduped per content by ReportLab
+        c.drawImage(ImageReader(io.BytesIO(data)), x, y, w, h)
+        return
+    reg = c._doc.getXObjectName(name)
+    if reg not in c._doc.idToObject:
+        if data[:2] == b"\xff\xd8":
+            img = jpeg_xobject(name, data)
+        else:
+            bw = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+            if bw is None:
+                raise RuntimeError("OpenCV decode failed")
+            img = BilevelImage(name, bw)
+        c._setXObjects(img)
+        c._doc.Reference(img, reg)
+        c._doc.addForm(name, img)
+    c.saveState()
+    c.translate(x, y)
+    c.scale(w, h)
+    c._code.append(f"/{reg} Do")
+    c.restoreState()
+    c._formsinuse.append(name)
@@ -12,6 +12,7 @@
 #
 # 3) Drop-in API:
 #    - get_quest(pool, used_ids, rng, tags_any=None) -> QuestItem(qid,text,tags)
+#    - draw_quests(pool, count, rng, used_ids=None) -> List[QuestItem] (Batch, gleiche Dedupe-Regel)
 #    - get_zone_for_hour(hour) -> Zone
 #    - get_hour_color(hour) -> (r,g,b) floats 0..1
 #    - fmt_hour(hour) -> "HH:00"
@@ -548,6 +549,37 @@ def get_quest(
     # If everything used, allow reset-pick (deterministic, still randomized)
     return cand_all[rng.randrange(len(cand_all))]
 
+def draw_quests(
+    pool: str,
+    count: int,
+    *,
+    rng: random.Random,
+    used_ids: Optional[Set[str]] = None
+) -> List[QuestItem]:
+    """
+    Batch variant of get_quest for a whole book: `count` items, no repeats until the
+    (unused part of the) pool is exhausted, then a fresh shuffled round (Reset-Pick).
+
+    One rng.sample per round instead of a list copy + used-filter per item.
+    used_ids (optional) is updated with the drawn qids.
+    """
+    if pool not in QUEST_POOLS:
+        raise ValueError(f"Unknown pool: {pool}")
+
+    items = QUEST_POOLS[pool]
+    if not items:
+        raise ValueError(f"Empty pool: {pool}")
+
+    used = used_ids if used_ids is not None else set()
+    fresh = [it for it in items if it.qid not in used] if used else items
+    out: List[QuestItem] = []
+    while len(out) < count:
+        src = fresh or items
+        out.extend(rng.sample(src, min(count - len(out), len(src))))
+        fresh = []
+    used.update(it.qid for it in out)
+    return out
+
 # =========================================================
 # OPTIONAL: simple pool stats (debug)
 # =========================================================